@@ -0,0 +1,68 @@
+import pandas as pd
+import numpy as np
+
+# Columnas clave que usa el modelo
+COL_REPROBADAS = "Indica la cantidad de asignaturas reprobadas desde su inicio de la carrera hasta la fecha. Si no has reprobado, marca 0"
+COL_MOTIVACION = "Indica tu nivel actual de motivación por estudiar tu carrera"
+
+# Niveles de alerta, de menor a mayor riesgo
+NIVELES_ALERTA = ["🟢 Bajo riesgo", "🟡 Riesgo medio", "🔴 Alto riesgo"]
+
+def verificar_columnas(df: pd.DataFrame, columnas):
+    """Lanza ValueError si falta alguna de las columnas."""
+    missing = [c for c in columnas if c not in df.columns]
+    if missing:
+        raise ValueError(
+            "No se encontraron las columnas necesarias en el dataset. "
+            f"Faltan: {missing}"
+        )
+
+
+def puntaje_lineal(df: pd.DataFrame) -> pd.Series:
+    """
+    Puntaje de riesgo por defecto:
+    1.5 × asignaturas reprobadas − 0.5 × motivación (mínimo 0).
+    """
+    verificar_columnas(df, (COL_REPROBADAS, COL_MOTIVACION))
+
+    puntaje = (
+        df[COL_REPROBADAS] * 1.5
+        - df[COL_MOTIVACION] * 0.5
+    )
+
+    # Ajustar valores negativos a 0
+    return puntaje.clip(lower=0)
+
+
+def calcular_alertas(df_raw: pd.DataFrame, puntuar=puntaje_lineal) -> pd.DataFrame:
+    """
+    Aplica el sistema de alerta académica a un DataFrame que
+    tenga al menos las columnas que necesita la función de puntaje
+    (por defecto COL_REPROBADAS y COL_MOTIVACION).
+
+    `puntuar` recibe el DataFrame y devuelve un puntaje por fila (mayor =
+    más riesgo); permite cambiar la fórmula lineal por un modelo aprendido.
+
+    Devuelve una copia del DataFrame con dos columnas nuevas:
+    - reprob_predicha
+    - nivel_alerta
+    """
+    # Copia superficial: solo se agregan columnas, el original no se modifica
+    df = df_raw.copy(deep=False)
+
+    # 1. Puntuación de riesgo
+    df["reprob_predicha"] = np.asarray(puntuar(df), dtype=float)
+
+    # 2. Percentiles para clasificar
+    p_bajo = np.percentile(df["reprob_predicha"], 70)
+    p_medio = np.percentile(df["reprob_predicha"], 85)
+
+    # 3. Nivel de alerta (vectorizado; lo que no cae en los dos primeros tramos es alto riesgo)
+    puntaje = df["reprob_predicha"].to_numpy()
+    df["nivel_alerta"] = np.select(
+        [puntaje <= p_bajo, puntaje <= p_medio],
+        NIVELES_ALERTA[:2],
+        default=NIVELES_ALERTA[2],
+    )
+
+    return df
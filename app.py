@@ -1,57 +1,61 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
+import os
 
-# Columnas clave que usa el modelo
-COL_REPROBADAS = "Indica la cantidad de asignaturas reprobadas desde su inicio de la carrera hasta la fecha. Si no has reprobado, marca 0"
-COL_MOTIVACION = "Indica tu nivel actual de motivación por estudiar tu carrera"
+from alertas import COL_REPROBADAS, COL_MOTIVACION, calcular_alertas, puntaje_lineal
+from carga import ESTADO_ERROR, ESTADO_LISTO, GestorCargas
+from carreras import ARCHIVO_CARRERAS, RegistroCarreras
+from longitudinal import CARPETA_OLAS, AlmacenOlas
+from modelo import ARCHIVO_MODELO, cargar_modelo, puntaje_modelo, reglas_modelo
+from prioridad import ColaPrioridad
+from privacidad import COL_CARRERA, COL_CLAVE, VAR_SECRETO, anonimizar_exportacion, huella_secreto, secreto_configurado, seudonimizar
+from validacion import REGLAS_ENCUESTA, ErrorValidacion, leer_y_validar
 
-def calcular_alertas(df_raw: pd.DataFrame) -> pd.DataFrame:
-    """
-    Aplica el sistema de alerta académica a un DataFrame que
-    tenga al menos las columnas:
-    - COL_REPROBADAS
-    - COL_MOTIVACION
-
-    Devuelve una copia del DataFrame con dos columnas nuevas:
-    - reprob_predicha
-    - nivel_alerta
-    """
-    df = df_raw.copy()
-
-    # Verificar que estén las columnas necesarias
-    missing = [c for c in (COL_REPROBADAS, COL_MOTIVACION) if c not in df.columns]
-    if missing:
-        raise ValueError(
-            "No se encontraron las columnas necesarias en el dataset. "
-            f"Faltan: {missing}"
-        )
 
-    # 1. Puntuación de riesgo (tu fórmula)
-    df["reprob_predicha"] = (
-        df[COL_REPROBADAS] * 1.5
-        - df[COL_MOTIVACION] * 0.5
-    )
+MODELO_LINEAL = "Fórmula lineal (1.5 × reprobadas − 0.5 × motivación)"
+MODELO_APRENDIDO = "Modelo aprendido (regresión logística)"
 
-    # 2. Ajustar valores negativos a 0
-    df["reprob_predicha"] = df["reprob_predicha"].clip(lower=0)
 
-    # 3. Percentiles para clasificar
-    p_bajo = np.percentile(df["reprob_predicha"], 70)
-    p_medio = np.percentile(df["reprob_predicha"], 85)
+@st.cache_resource
+def cargar_modelo_cacheado(ruta: str) -> dict:
+    return cargar_modelo(ruta)
 
-    # 4. Función para nivel de alerta
-    def nivel_alerta(x):
-        if x <= p_bajo:
-            return "🟢 Bajo riesgo"
-        elif x <= p_medio:
-            return "🟡 Riesgo medio"
-        else:
-            return "🔴 Alto riesgo"
 
-    df["nivel_alerta"] = df["reprob_predicha"].apply(nivel_alerta)
+@st.cache_resource
+def cargar_registro_carreras(ruta: str) -> RegistroCarreras:
+    return RegistroCarreras.desde_archivo(ruta)
+
 
-    return df
+# Tamaño máximo de la tabla de prioridad
+K_MAX_PRIORIDAD = 500
+
+
+def obtener_cola_prioridad(df_resultado: pd.DataFrame, firma: tuple) -> ColaPrioridad:
+    """
+    Cola de prioridad guardada en la sesión. Si el resultado solo creció
+    (llegó un archivo más), se agregan las filas nuevas en vez de rehacerla.
+    """
+    estado = st.session_state.get("cola_prioridad")
+    grupos = df_resultado[COL_CARRERA] if COL_CARRERA in df_resultado.columns else None
+
+    if (
+        estado is not None
+        and firma[:len(estado["firma"])] == estado["firma"]
+        and len(df_resultado) >= len(estado["cola"])
+    ):
+        cola = estado["cola"]
+        inicio = len(cola)
+        if len(df_resultado) > inicio:
+            cola.agregar(
+                df_resultado["reprob_predicha"].to_numpy()[inicio:],
+                None if grupos is None else grupos.to_numpy()[inicio:],
+            )
+    else:
+        cola = ColaPrioridad(k=K_MAX_PRIORIDAD)
+        cola.agregar(df_resultado["reprob_predicha"].to_numpy(), None if grupos is None else grupos.to_numpy())
+
+    st.session_state["cola_prioridad"] = {"firma": firma, "cola": cola}
+    return cola
 
 
 # Configuración de la página
@@ -460,8 +464,8 @@ elif pagina == "Cómo funciona el modelo":
         El código procesa datos específicamente recopilados, aplicando filtros tal como:
 
         - **Filtro de Carreras**
-             - El script contiene un "diccionario" con solamente 6 carreras seleccionadas que se consideran en el análisis. Estas son: Ingeniería Civil Industrial,
-             Ingeniería Civil Eléctrica, Ingeniería Civil Electrónica, Ingeniería Civil Informática y Ingeniería Civil Comercial. 
+             - Las carreras consideradas en el análisis están en un registro versionado (`carreras.json`), organizado por facultad. Actualmente incluye: Ingeniería Civil Industrial,
+             Ingeniería Civil, Ingeniería Civil Eléctrica, Ingeniería Civil Electrónica, Ingeniería Civil Informática e Ingeniería Comercial. 
 
         - **Filtro de admisión**
             - En el archivo Data_UINN_Facultad.csv, el código busca la columna Código Carrera Nacional. 
@@ -521,6 +525,9 @@ elif pagina == "Cómo funciona el modelo":
 
         - Si el resultado es negativo, se reajusta a 0, ya que el puntaje negativo no tiene sentido en este contexto.
         - Los coeficientes (1.5 y 0.5) pueden ajustarse en función de análisis posteriores y validación con datos reales.
+        - Como alternativa, el sistema incluye un **modelo aprendido** (regresión logística) entrenado con las respuestas de la propia encuesta:
+          usa todas las escalas numéricas y aprende a reconocer a quienes declaran estar pensando en abandonar o haberlo decidido.
+          En ese caso, el puntaje de riesgo corresponde a la probabilidad estimada de abandono.
         """
     )
     
@@ -532,11 +539,12 @@ elif pagina == "Cómo funciona el modelo":
 
         ### **A. Traducción (El Mapeo)**
 
-        El codigo toma la base de Admisión (que usa Códigos Nacionales, ej. 13072) y crea una columna "falsa" traduciéndolos a Códigos UDEC (ej. 3309) usando el PDF como diccionario3
+        El codigo toma la base de Admisión (que usa Códigos Nacionales, ej. 13072) y crea una columna "falsa" traduciéndolos a Códigos UDEC (ej. 3309) usando el registro de carreras (construido a partir del PDF de atributos).
+        Los códigos que no están en el registro no se descartan en silencio: se cuentan e informan en el reporte.
 
-        ### **B. El Match (Inner Join)**
+        ### **B. El Match (Cruce ordenado)**
 
-        Usa la funcion pd.merge con el método inner.
+        Usa un cruce por listas ordenadas (sort-merge) del módulo `cruce`. La base de admisión se agrega por bloques, así una década de datos no necesita caber completa en memoria.
 
         - Toma la tabla de "Promedios de Admisión" (Anteriormente traducida a código_UDEC).
 
@@ -550,7 +558,7 @@ elif pagina == "Cómo funciona el modelo":
                 
         - Si encuentra coincidencia, une ambas filas en una sola.
 
-        - Si no encuentra coincidencia, descarta ambas filas.
+        - Si no encuentra coincidencia, la fila no entra al reporte, pero queda contada en el diagnóstico del cruce (carreras que están solo en una de las dos bases).
 
         """
     )
@@ -642,45 +650,136 @@ elif pagina == "Sistema en acción":
         ["Usar datos del proyecto", "Subir un archivo propio (.csv)"]
     )
 
+    # Modelo de puntaje: fórmula fija o modelo aprendido (si hay uno entrenado)
+    opciones_modelo = [MODELO_LINEAL]
+    if os.path.exists(ARCHIVO_MODELO):
+        opciones_modelo.append(MODELO_APRENDIDO)
+    opcion_modelo = st.radio("Modelo de puntaje:", opciones_modelo, horizontal=True)
+
+    # Las reglas de validación incluyen todas las columnas que usa el modelo elegido
+    if opcion_modelo == MODELO_APRENDIDO:
+        modelo = cargar_modelo_cacheado(ARCHIVO_MODELO)
+        puntuar = puntaje_modelo(modelo)
+        reglas = reglas_modelo(modelo)
+    else:
+        puntuar = puntaje_lineal
+        reglas = REGLAS_ENCUESTA
+
     df_resultado = None
+    firma_resultado = None
     error_msg = None
 
     # 1) Usar el CSV del proyecto
     if opcion_fuente == "Usar datos del proyecto":
         try:
-            df_base = pd.read_csv("Cuestionario motivacion academica.csv")
-            df_resultado = calcular_alertas(df_base)
+            with open("Cuestionario motivacion academica.csv", "rb") as f:
+                df_base, df_cuarentena, reporte_proyecto = leer_y_validar(f.read(), reglas)
+            columnas_modelo = [r["columna"] for r in reglas]
+            df_base = seudonimizar(df_base, columnas_modelo=columnas_modelo)
+            df_resultado = calcular_alertas(df_base, puntuar)
+
+            # Igual que con los archivos subidos: las filas inválidas se informan
+            if reporte_proyecto.filas_invalidas:
+                st.warning(
+                    f"Datos del proyecto: {reporte_proyecto.filas_invalidas} fila(s) quedaron "
+                    f"en cuarentena y no se puntuaron.\n\n{reporte_proyecto.resumen()}"
+                )
+                with st.expander("Ver filas en cuarentena de los datos del proyecto"):
+                    st.dataframe(seudonimizar(df_cuarentena, columnas_modelo=columnas_modelo))
+            firma_resultado = ("proyecto", opcion_modelo)
         except FileNotFoundError:
             error_msg = (
                 "No se encontró el archivo **'Cuestionario motivacion academica.csv'** "
                 "en el mismo directorio que `app.py`."
             )
+        except ErrorValidacion as e:
+            error_msg = f"Los datos del proyecto no pasaron la validación:\n\n{e.reporte.resumen()}"
         except Exception as e:
             error_msg = f"Ocurrió un error al procesar los datos del proyecto: {e}"
 
-    # 2) Subir un archivo propio
+    # 2) Subir uno o más archivos propios (se procesan en segundo plano)
     else:
-        archivo = st.file_uploader(
-            "Sube un archivo .csv con el mismo formato de la encuesta de motivación:",
-            type="csv"
+        if "gestor_cargas" not in st.session_state:
+            st.session_state["gestor_cargas"] = GestorCargas()
+        gestor = st.session_state["gestor_cargas"]
+
+        archivos = st.file_uploader(
+            "Sube uno o más archivos .csv con el mismo formato de la encuesta de motivación:",
+            type="csv",
+            accept_multiple_files=True,
         )
-        if archivo is not None:
-            try:
-                df_base = pd.read_csv(archivo)
-                df_resultado = calcular_alertas(df_base)
-            except Exception as e:
-                error_msg = (
-                    "No se pudo procesar el archivo subido. "
-                    "Revisa que tenga las columnas necesarias:\n\n"
-                    f"- {COL_REPROBADAS}\n"
-                    f"- {COL_MOTIVACION}\n\n"
-                    f"Detalle técnico: {e}"
-                )
+
+        # La clave seudónima solo se usa para seguir estudiantes entre olas y es
+        # la parte cara de la seudonimización; sin ella los identificadores solo se eliminan
+        generar_clave = st.checkbox(
+            f"Generar la clave seudónima **{COL_CLAVE}** (desde RUT, correo u otro identificador) "
+            "para seguir a los estudiantes entre olas",
+            value=secreto_configurado(),
+            help="Con archivos grandes y un identificador por estudiante, el cálculo tarda más.",
+        )
+
+        # Encolar los archivos nuevos y olvidar los que se quitaron del uploader
+        claves_actuales = set()
+        for archivo in archivos or []:
+            # Cambiar de modelo o de clave seudónima vuelve a encolar el archivo
+            clave = f"{archivo.file_id}:{opcion_modelo}:{generar_clave}"
+            claves_actuales.add(clave)
+            gestor.enviar(clave, archivo.name, archivo.getvalue(), puntuar, reglas, generar_clave)
+        for clave in list(gestor.trabajos):
+            if clave not in claves_actuales:
+                gestor.quitar(clave)
+
+        # Mientras haya archivos pendientes, este bloque se refresca solo cada segundo
+        @st.fragment(run_every=1 if gestor.hay_pendientes() else None)
+        def mostrar_avance_cargas():
+            listos_antes = st.session_state.get("cargas_listas", 0)
+
+            for clave, trabajo in list(gestor.trabajos.items()):
+                col_nombre, col_barra, col_boton = st.columns([3, 4, 1])
+                col_nombre.markdown(f"**{trabajo.nombre}** — {trabajo.estado}")
+                col_barra.progress(trabajo.progreso)
+                if not trabajo.terminado:
+                    if col_boton.button("Cancelar", key=f"cancelar_{clave}"):
+                        gestor.cancelar(clave)
+                if trabajo.estado == ESTADO_ERROR and trabajo.reporte is not None:
+                    st.error(f"No se pudo procesar **{trabajo.nombre}**.\n\n{trabajo.reporte.resumen()}")
+                elif trabajo.estado == ESTADO_ERROR:
+                    # Los problemas de columnas y valores llegan con reporte; esto es otro error
+                    st.error(
+                        f"No se pudo procesar **{trabajo.nombre}**. "
+                        "Revisa que sea un CSV de la encuesta de motivación.\n\n"
+                        f"Detalle técnico: {trabajo.error}"
+                    )
+                elif trabajo.estado == ESTADO_LISTO and trabajo.reporte.filas_invalidas:
+                    # Filas con problemas: se apartan y no se puntúan
+                    st.warning(
+                        f"**{trabajo.nombre}**: {trabajo.reporte.filas_invalidas} fila(s) "
+                        f"quedaron en cuarentena y no se puntuaron.\n\n{trabajo.reporte.resumen()}"
+                    )
+                    with st.expander(f"Ver filas en cuarentena de {trabajo.nombre}"):
+                        st.dataframe(trabajo.cuarentena)
+
+            if gestor.hay_pendientes() and st.button("Cancelar todos"):
+                gestor.cancelar_todo()
+
+            # Cuando termina un archivo, recargamos la página para mostrar sus resultados
+            listos_ahora = sum(t.terminado for t in gestor.trabajos.values())
+            st.session_state["cargas_listas"] = listos_ahora
+            if listos_ahora != listos_antes:
+                st.rerun(scope="app")
+
+        mostrar_avance_cargas()
+        df_resultado = gestor.resultados()
+        firma_resultado = ("archivos", *gestor.claves_listas())
 
     # Mostrar errores si los hay
     if error_msg:
         st.error(error_msg)
 
+    # Sin resultados todavía no hay nada más que mostrar
+    if df_resultado is None:
+        st.stop()
+
     # Si tenemos resultado, lo mostramos
     if df_resultado is not None:
         st.markdown("### Resumen de niveles de alerta")
@@ -695,6 +794,49 @@ elif pagina == "Sistema en acción":
 
     st.markdown("---")
 
+    # --- PRIORIDAD: los estudiantes de mayor riesgo ---
+    st.markdown("### Prioridad")
+
+    st.info(
+        "Estudiantes con mayor puntaje de riesgo, del más alto al más bajo. "
+        "Sirve como punto de partida para decidir a quién contactar primero."
+    )
+
+    col_k, col_carrera = st.columns(2)
+    k_prioridad = col_k.number_input(
+        "Cantidad de estudiantes:", min_value=1, max_value=K_MAX_PRIORIDAD, value=50, step=10
+    )
+    carreras = []
+    if COL_CARRERA in df_resultado.columns:
+        carreras = sorted(df_resultado[COL_CARRERA].dropna().unique().tolist())
+    registro_carreras = cargar_registro_carreras(ARCHIVO_CARRERAS)
+    carrera_prioridad = col_carrera.selectbox(
+        "Carrera:",
+        ["Todas"] + carreras,
+        format_func=lambda c: c if c == "Todas" else registro_carreras.nombre_udec(c),
+    )
+
+    cola = obtener_cola_prioridad(df_resultado, firma_resultado)
+    indices_prioridad = cola.consultar(
+        None if carrera_prioridad == "Todas" else carrera_prioridad,
+        int(k_prioridad),
+    )
+
+    columnas_prioridad = [
+        c for c in ("archivo_origen", COL_CARRERA, COL_CLAVE, COL_REPROBADAS, COL_MOTIVACION, "reprob_predicha", "nivel_alerta")
+        if c in df_resultado.columns
+    ]
+    df_prioridad = df_resultado.iloc[indices_prioridad][columnas_prioridad]
+    if COL_CARRERA in df_prioridad.columns:
+        df_prioridad.insert(
+            columnas_prioridad.index(COL_CARRERA) + 1,
+            "Nombre_Carrera",
+            registro_carreras.nombres_udec(df_prioridad[COL_CARRERA]),
+        )
+    st.dataframe(df_prioridad)
+
+    st.markdown("---")
+
     # --- 2) FILTRO POR NIVEL DE ALERTA ---
     st.markdown("### Distribución de niveles de alerta (según filtro)")
 
@@ -786,6 +928,7 @@ elif pagina == "Sistema en acción":
 
     # Columnas relevantes
     columnas_mostrar = [
+        "archivo_origen",
         COL_REPROBADAS,
         COL_MOTIVACION,
         "reprob_predicha",
@@ -798,7 +941,8 @@ elif pagina == "Sistema en acción":
         st.dataframe(df_filtrado[columnas_mostrar])
 
     # --- 4) Botón para descargar (también según filtro) ---
-    csv_bytes = df_filtrado.to_csv(index=False, encoding="utf-8-sig").encode("utf-8-sig")
+    # Antes de exportar se ocultan los grupos pequeños de carrera/año/género (k-anonimato)
+    csv_bytes = anonimizar_exportacion(df_filtrado).to_csv(index=False, encoding="utf-8-sig").encode("utf-8-sig")
     st.download_button(
         "⬇️ Descargar resultados filtrados en CSV",
         data=csv_bytes,
@@ -806,6 +950,121 @@ elif pagina == "Sistema en acción":
         mime="text/csv",
     )
 
+    # --- 5) SEGUIMIENTO ENTRE OLAS (solo con archivos propios) ---
+    if opcion_fuente != "Usar datos del proyecto":
+        # Las olas subidas se identifican por la clave del gestor (no por el
+        # nombre del archivo, que puede repetirse)
+        olas_listas = {
+            clave: t.resultado
+            for clave, t in gestor.trabajos.items()
+            if t.estado == ESTADO_LISTO
+        }
+
+        # Con un secreto fijo las claves seudónimas coinciden entre sesiones y
+        # las olas se guardan en disco; sin él, duran solo lo que dura la sesión
+        persistente = secreto_configurado()
+        if "almacen_olas" not in st.session_state:
+            carpeta_olas = os.path.join(CARPETA_OLAS, huella_secreto()) if persistente else None
+            st.session_state["almacen_olas"] = AlmacenOlas(carpeta_olas)
+            st.session_state["olas_registradas"] = {}
+        almacen = st.session_state["almacen_olas"]
+        registradas = st.session_state["olas_registradas"]
+
+        if persistente:
+            # Cada archivo con clave seudónima se guarda una vez (el almacén lo
+            # identifica por su contenido). Se compara el resultado mismo, no
+            # su id(), que Python puede reutilizar
+            for clave, df_ola in olas_listas.items():
+                if COL_CLAVE in df_ola.columns and registradas.get(clave) is not df_ola:
+                    almacen.guardar_ola(df_ola, COL_CLAVE, gestor.trabajos[clave].nombre)
+                    registradas[clave] = df_ola
+            hay_olas = len(almacen.olas) >= 2
+        else:
+            hay_olas = len(olas_listas) >= 2
+
+        if hay_olas:
+            st.markdown("---")
+            st.markdown("### Seguimiento entre olas de la encuesta")
+
+            if persistente:
+                st.info(
+                    "Cada archivo subido con la clave seudónima "
+                    f"**{COL_CLAVE}** (generada desde el RUT, correo u otro identificador) "
+                    "se guarda como una ola de la encuesta y queda disponible en las "
+                    "próximas sesiones."
+                )
+                col_clave = COL_CLAVE
+            else:
+                st.info(
+                    "Cada archivo subido se considera una ola de la encuesta. "
+                    "Para seguir a un mismo estudiante entre olas se necesita una columna "
+                    "con una clave seudónima común a todos los archivos.\n\n"
+                    "Las olas se guardan solo durante esta sesión. Para guardarlas entre "
+                    f"sesiones hay que configurar la variable de entorno {VAR_SECRETO}: "
+                    "sin ese secreto las claves seudónimas cambian en cada reinicio."
+                )
+
+                columnas_comunes = set.intersection(*(set(df.columns) for df in olas_listas.values()))
+                columnas_comunes -= {COL_REPROBADAS, COL_MOTIVACION, "reprob_predicha", "nivel_alerta"}
+
+                col_clave = None
+                if not columnas_comunes:
+                    st.warning("Los archivos no tienen columnas en común que sirvan como clave.")
+                else:
+                    # La clave seudónima, si existe, aparece primero
+                    opciones_clave = sorted(columnas_comunes, key=lambda c: (c != COL_CLAVE, c))
+                    col_clave = st.selectbox("Columna con la clave del estudiante:", opciones_clave)
+
+                    # Registrar solo las olas nuevas o las que cambiaron de clave o de resultado
+                    for clave in list(registradas):
+                        if clave not in olas_listas:
+                            almacen.quitar_ola(clave)
+                            del registradas[clave]
+                    for clave, df_ola in olas_listas.items():
+                        anterior = registradas.get(clave)
+                        if anterior is None or anterior[0] != col_clave or anterior[1] is not df_ola:
+                            almacen.agregar_ola(clave, df_ola, col_clave, etiqueta=gestor.trabajos[clave].nombre)
+                            registradas[clave] = (col_clave, df_ola)
+
+            if col_clave is not None:
+                # Las olas se muestran con el nombre del archivo (y la fecha en
+                # que se guardaron), numeradas si el nombre se repite
+                etiquetas_olas = {}
+                vistos = {}
+                for nombre_ola in almacen.olas:
+                    info = almacen.info(nombre_ola)
+                    etiqueta = info["etiqueta"]
+                    if "guardada" in info:
+                        etiqueta = f"{etiqueta} ({info['guardada']})"
+                    vistos[etiqueta] = vistos.get(etiqueta, 0) + 1
+                    etiquetas_olas[nombre_ola] = etiqueta if vistos[etiqueta] == 1 else f"{etiqueta} ({vistos[etiqueta]})"
+
+                claves_olas = almacen.olas
+                col_a, col_b = st.columns(2)
+                ola_a = col_a.selectbox(
+                    "Ola inicial:", claves_olas, index=0, format_func=etiquetas_olas.get
+                )
+                ola_b = col_b.selectbox(
+                    "Ola final:", claves_olas, index=len(claves_olas) - 1, format_func=etiquetas_olas.get
+                )
+
+                if ola_a == ola_b:
+                    st.warning("Selecciona dos olas distintas para compararlas.")
+                else:
+                    st.markdown("#### Transiciones entre niveles de alerta")
+                    st.dataframe(
+                        almacen.matriz_transicion(ola_a, ola_b).rename_axis(
+                            index=etiquetas_olas[ola_a], columns=etiquetas_olas[ola_b]
+                        )
+                    )
+
+                    st.markdown("#### ¿Quiénes empeoraron?")
+                    df_empeoraron = almacen.empeoraron(ola_a, ola_b)
+                    if df_empeoraron.empty:
+                        st.success("Ningún estudiante subió de nivel de alerta entre estas olas.")
+                    else:
+                        st.dataframe(df_empeoraron)
+
 
 
 
@@ -819,6 +1078,8 @@ elif pagina == "Nuestro enfoque":
 
         - **1. Privacidad**  
           - Se ocultan datos sensibles y se evita entregar información a actores no pertinentes, como podria ser profesores o administrativos que no estén relacionados con el bienestar estudiantil.
+          - Antes de calcular las alertas, los identificadores (RUT, correo, nombre) se eliminan (o, si se pide para seguir estudiantes entre olas, se reemplazan por una clave seudónima) y solo se conservan las respuestas que usa el modelo, la carrera, el género y el año de matrícula (los años antiguos se agrupan). La ciudad de origen, las respuestas de texto libre y cualquier otra columna se eliminan.
+          - Al descargar resultados, los grupos de carrera, año y género con menos de 5 estudiantes se ocultan.
         
         - **2. Proporcionalidad**  
             - Utilizamos únicamente variables necesarias para generar alertas significativas, evitando recopilar datos excesivos que puedan invadir la privacidad de los estudiantes o
@@ -0,0 +1,198 @@
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from alertas import calcular_alertas, puntaje_lineal
+from privacidad import seudonimizar
+from validacion import REGLAS_ENCUESTA, ErrorValidacion, validar_encabezado, validar_filas
+
+# Estados posibles de cada archivo subido
+ESTADO_EN_COLA = "⏳ En cola"
+ESTADO_PROCESANDO = "⚙️ Procesando"
+ESTADO_LISTO = "✅ Listo"
+ESTADO_ERROR = "❌ Error"
+ESTADO_CANCELADO = "⛔ Cancelado"
+
+# Filas leídas por bloque (entre bloques se reporta progreso y se revisa la cancelación)
+FILAS_POR_BLOQUE = 5000
+
+
+class CargaCancelada(Exception):
+    """Se lanza dentro del trabajador cuando el usuario cancela un archivo."""
+
+
+class TrabajoCarga:
+    """
+    Estado de un archivo subido que se procesa en segundo plano.
+
+    Los atributos los escribe el hilo trabajador y los lee la página,
+    por lo que solo se guardan valores simples (texto, número, DataFrame).
+    """
+
+    def __init__(self, nombre: str, datos: bytes):
+        self.nombre = nombre
+        self.datos = datos
+        self.estado = ESTADO_EN_COLA
+        self.progreso = 0.0
+        self.resultado = None
+        self.cuarentena = None
+        self.reporte = None
+        self.error = None
+        self.fin = None
+        self.future = None
+        self._cancelar = threading.Event()
+
+    @property
+    def terminado(self) -> bool:
+        return self.estado in (ESTADO_LISTO, ESTADO_ERROR, ESTADO_CANCELADO)
+
+    def cancelar(self):
+        self._cancelar.set()
+        # Si todavía no empezó, el pool lo descarta directamente
+        if self.future is not None and self.future.cancel():
+            self.estado = ESTADO_CANCELADO
+
+    def _revisar_cancelacion(self):
+        if self._cancelar.is_set():
+            raise CargaCancelada()
+
+
+def _leer_csv_por_bloques(trabajo: TrabajoCarga, formato: dict) -> pd.DataFrame:
+    """
+    Lee el CSV en bloques para poder informar avance y cancelar a mitad de camino.
+    La lectura ocupa la primera mitad de la barra de progreso.
+    """
+    total_filas = max(trabajo.datos.count(b"\n"), 1)
+    bloques = []
+    filas_leidas = 0
+
+    lector = pd.read_csv(io.BytesIO(trabajo.datos), chunksize=FILAS_POR_BLOQUE, **formato)
+    for bloque in lector:
+        trabajo._revisar_cancelacion()
+        bloques.append(bloque)
+        filas_leidas += len(bloque)
+        trabajo.progreso = min(filas_leidas / total_filas, 1.0) * 0.5
+
+    if not bloques:
+        # Solo encabezado: se devuelve vacío y la validación lo rechaza con su reporte
+        return pd.read_csv(io.BytesIO(trabajo.datos), nrows=0, **formato)
+    return pd.concat(bloques, ignore_index=True)
+
+
+def _procesar(trabajo: TrabajoCarga, aplicar_seudonimos: bool, puntuar, reglas: list, generar_clave: bool):
+    """Valida, lee, seudonimiza y puntúa un archivo. Se ejecuta dentro del pool de hilos."""
+    try:
+        trabajo._revisar_cancelacion()
+        trabajo.estado = ESTADO_PROCESANDO
+
+        # Formato y columnas se revisan con los primeros KB, antes de parsear todo
+        formato, reglas = validar_encabezado(trabajo.datos, reglas)
+
+        df_base = _leer_csv_por_bloques(trabajo, formato)
+        trabajo._revisar_cancelacion()
+
+        df_base, df_cuarentena, trabajo.reporte = validar_filas(df_base, reglas, formato)
+
+        if aplicar_seudonimos:
+            columnas_modelo = [r["columna"] for r in reglas]
+            df_base = seudonimizar(df_base, columnas_modelo=columnas_modelo, generar_clave=generar_clave)
+            df_cuarentena = seudonimizar(df_cuarentena, columnas_modelo=columnas_modelo, generar_clave=generar_clave)
+        trabajo.cuarentena = df_cuarentena
+
+        df_resultado = calcular_alertas(df_base, puntuar)
+        trabajo._revisar_cancelacion()
+
+        trabajo.resultado = df_resultado
+        trabajo.fin = time.monotonic()
+        trabajo.progreso = 1.0
+        trabajo.estado = ESTADO_LISTO
+    except CargaCancelada:
+        trabajo.estado = ESTADO_CANCELADO
+    except ErrorValidacion as e:
+        trabajo.reporte = e.reporte
+        trabajo.error = str(e)
+        trabajo.estado = ESTADO_ERROR
+    except Exception as e:
+        trabajo.error = str(e)
+        trabajo.estado = ESTADO_ERROR
+    finally:
+        # Ya no necesitamos los bytes originales
+        trabajo.datos = b""
+
+
+class GestorCargas:
+    """
+    Administra la cola de archivos subidos y el pool de hilos que los procesa.
+
+    Se guarda en st.session_state para que sobreviva a cada recarga del script;
+    los resultados quedan disponibles a medida que cada archivo termina.
+    """
+
+    def __init__(self, max_hilos: int = 2, aplicar_seudonimos: bool = True):
+        self._pool = ThreadPoolExecutor(max_workers=max_hilos, thread_name_prefix="carga")
+        self.aplicar_seudonimos = aplicar_seudonimos
+        self.trabajos = {}
+
+    def enviar(
+        self,
+        clave: str,
+        nombre: str,
+        datos: bytes,
+        puntuar=puntaje_lineal,
+        reglas: list = REGLAS_ENCUESTA,
+        generar_clave: bool = False,
+    ) -> TrabajoCarga:
+        """
+        Encola un archivo si no se había enviado antes (misma clave).
+        `puntuar` es la función de puntaje que se pasa a calcular_alertas y
+        `reglas` las columnas que esa función necesita (se validan antes).
+        Con `generar_clave` la seudonimización agrega la clave del estudiante.
+        """
+        if clave in self.trabajos:
+            return self.trabajos[clave]
+
+        trabajo = TrabajoCarga(nombre, datos)
+        trabajo.future = self._pool.submit(
+            _procesar, trabajo, self.aplicar_seudonimos, puntuar, reglas, generar_clave
+        )
+        self.trabajos[clave] = trabajo
+        return trabajo
+
+    def cancelar(self, clave: str):
+        if clave in self.trabajos:
+            self.trabajos[clave].cancelar()
+
+    def cancelar_todo(self):
+        for trabajo in self.trabajos.values():
+            trabajo.cancelar()
+
+    def quitar(self, clave: str):
+        """Cancela (si hace falta) y olvida un archivo que ya no está en el uploader."""
+        trabajo = self.trabajos.pop(clave, None)
+        if trabajo is not None:
+            trabajo.cancelar()
+
+    def hay_pendientes(self) -> bool:
+        return any(not t.terminado for t in self.trabajos.values())
+
+    def claves_listas(self) -> list:
+        """Claves de los archivos terminados, en el orden en que terminaron."""
+        listos = [(t.fin, clave) for clave, t in self.trabajos.items() if t.estado == ESTADO_LISTO]
+        return [clave for _, clave in sorted(listos)]
+
+    def resultados(self) -> pd.DataFrame | None:
+        """
+        Une los resultados de los archivos terminados (en orden de término,
+        así cada archivo nuevo queda al final), agregando la columna
+        'archivo_origen'. Devuelve None si todavía no hay ninguno listo.
+        """
+        listos = [
+            self.trabajos[clave].resultado.assign(archivo_origen=self.trabajos[clave].nombre)
+            for clave in self.claves_listas()
+        ]
+        if not listos:
+            return None
+        return pd.concat(listos, ignore_index=True)
@@ -0,0 +1,139 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+ARCHIVO_CARRERAS = "carreras.json"
+
+# Valor de la tabla de traducción para códigos sin carrera asociada
+SIN_MAPEO = -1
+
+
+class TraduccionCodigos:
+    """Resultado de traducir una columna de códigos con el registro."""
+
+    def __init__(self, codigos: pd.Series, sin_mapeo: dict, vacios: int):
+        self.codigos = codigos
+        # código original -> cantidad de filas que no se pudieron traducir
+        self.sin_mapeo = sin_mapeo
+        self.vacios = vacios
+
+    @property
+    def total_sin_mapeo(self) -> int:
+        return int(sum(self.sin_mapeo.values()))
+
+    def resumen(self) -> str:
+        if not self.sin_mapeo and not self.vacios:
+            return "Todos los códigos se tradujeron."
+        partes = [f"{codigo} ({cantidad} fila(s))" for codigo, cantidad in self.sin_mapeo.items()]
+        texto = f"{self.total_sin_mapeo} fila(s) con código sin mapeo"
+        if partes:
+            texto += ": " + ", ".join(partes)
+        if self.vacios:
+            texto += f". {self.vacios} fila(s) sin código."
+        return texto
+
+
+def _tabla(origen: np.ndarray, destino: np.ndarray) -> tuple:
+    """
+    Tabla de traducción densa: tabla[codigo - desplazamiento] = destino.
+    Los códigos de carrera son enteros acotados (unos miles), así que un
+    arreglo indexado es más rápido que un dict o Series.map.
+    """
+    if len(origen) == 0:
+        return np.empty(0, dtype=np.int64), 0
+    desplazamiento = int(origen.min())
+    tabla = np.full(int(origen.max()) - desplazamiento + 1, SIN_MAPEO, dtype=np.int64)
+    tabla[origen - desplazamiento] = destino
+    return tabla, desplazamiento
+
+
+class RegistroCarreras:
+    """
+    Registro de carreras cargado desde un archivo de configuración versionado
+    (carreras.json): código nacional <-> código UDEC <-> nombre, por facultad.
+    """
+
+    def __init__(self, config: dict):
+        self.version = str(config["version"])
+
+        filas = [
+            {**carrera, "facultad": facultad["nombre"]}
+            for facultad in config["facultades"]
+            for carrera in facultad["carreras"]
+        ]
+        self.carreras = pd.DataFrame(filas, columns=["codigo_nacional", "codigo_udec", "nombre", "facultad"])
+
+        for col in ("codigo_nacional", "codigo_udec"):
+            repetidos = self.carreras[col][self.carreras[col].duplicated()].tolist()
+            if repetidos:
+                raise ValueError(f"Códigos repetidos en '{col}' del registro de carreras: {repetidos}")
+
+        nacional = self.carreras["codigo_nacional"].to_numpy(dtype=np.int64)
+        udec = self.carreras["codigo_udec"].to_numpy(dtype=np.int64)
+        posiciones = np.arange(len(self.carreras), dtype=np.int64)
+
+        self._nacional_a_udec = _tabla(nacional, udec)
+        self._udec_a_nacional = _tabla(udec, nacional)
+        self._udec_a_posicion = _tabla(udec, posiciones)
+        self._nombres = self.carreras["nombre"].to_numpy(dtype=object)
+
+    @classmethod
+    def desde_archivo(cls, ruta: str = ARCHIVO_CARRERAS) -> "RegistroCarreras":
+        with open(ruta, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    @staticmethod
+    def _buscar(tabla_y_desplazamiento: tuple, codigos) -> tuple:
+        """
+        Traduce en bloque con la tabla densa. Devuelve (traducidos, vacios, originales)
+        donde traducidos vale SIN_MAPEO para lo que no está en la tabla.
+        """
+        tabla, desplazamiento = tabla_y_desplazamiento
+        originales = np.asarray(codigos)
+        if not np.issubdtype(originales.dtype, np.number):
+            originales = pd.to_numeric(pd.Series(codigos), errors="coerce").to_numpy(dtype=float)
+        originales = originales.astype(float, copy=False)
+
+        vacios = np.isnan(originales)
+        enteros = np.where(vacios, -1, originales).astype(np.int64)
+        posiciones = enteros - desplazamiento
+        # Fuera de la tabla o con decimales (ej. 13072.5) no tiene mapeo
+        en_rango = (posiciones >= 0) & (posiciones < len(tabla)) & (enteros == originales)
+
+        traducidos = np.full(len(originales), SIN_MAPEO, dtype=np.int64)
+        traducidos[en_rango] = tabla[posiciones[en_rango]]
+        return traducidos, vacios, originales
+
+    def _traducir(self, tabla_y_desplazamiento: tuple, codigos) -> TraduccionCodigos:
+        traducidos, vacios, originales = self._buscar(tabla_y_desplazamiento, codigos)
+
+        no_traducidos = traducidos == SIN_MAPEO
+        conteo = {
+            (int(v) if float(v).is_integer() else float(v)): int(c)
+            for v, c in pd.Series(originales[no_traducidos & ~vacios]).value_counts(sort=False).sort_index().items()
+        }
+
+        index = codigos.index if isinstance(codigos, pd.Series) else None
+        serie = pd.Series(pd.arrays.IntegerArray(traducidos, no_traducidos), index=index)
+        return TraduccionCodigos(serie, conteo, int(vacios.sum()))
+
+    def nacional_a_udec(self, codigos) -> TraduccionCodigos:
+        """Código de carrera nacional -> código UDEC (NA si no está en el registro)."""
+        return self._traducir(self._nacional_a_udec, codigos)
+
+    def udec_a_nacional(self, codigos) -> TraduccionCodigos:
+        """Código UDEC -> código de carrera nacional (NA si no está en el registro)."""
+        return self._traducir(self._udec_a_nacional, codigos)
+
+    def nombres_udec(self, codigos) -> pd.Series:
+        """Nombre de la carrera para cada código UDEC (NaN si no está en el registro)."""
+        posiciones, _, _ = self._buscar(self._udec_a_posicion, codigos)
+        nombres = np.append(self._nombres, np.nan)[posiciones]  # SIN_MAPEO (-1) cae en el NaN
+        index = codigos.index if isinstance(codigos, pd.Series) else None
+        return pd.Series(nombres, index=index, dtype=object)
+
+    def nombre_udec(self, codigo) -> str:
+        """Nombre de una sola carrera; si no está registrada, devuelve el código."""
+        nombre = self.nombres_udec([codigo]).iloc[0]
+        return str(codigo) if pd.isna(nombre) else nombre
@@ -0,0 +1,566 @@
+"""
+Cruce fuera de memoria (out-of-core) entre bases grandes, por ejemplo una
+década de admisión contra varias olas de encuesta.
+
+Cada base (uno o más CSV) se lee por bloques y se reparte en particiones en
+disco según el hash de la clave. Cada partición queda en trozos de a lo más
+FILAS_EN_BUFFER filas. Luego se cruza partición por partición:
+
+- el lado más chico de la partición se carga en rebanadas de a lo más
+  FILAS_MAX_CONSTRUCCION filas (si una clave concentra muchas filas, la
+  partición se procesa en varias pasadas en vez de cargarse completa);
+- cada trozo del otro lado se cruza contra la rebanada con un merge de
+  listas ordenadas;
+- los pares que calzan se entregan en DataFrames de a lo más
+  FILAS_POR_SALIDA filas, sin armar el producto completo de cada clave.
+
+Así la memoria queda acotada por esas constantes y no por el tamaño de las
+bases ni por la carrera más grande. Para cruces por carrera conviene igual
+agregar primero (agregar_por_bloques): el producto admisión × encuesta de
+una misma carrera casi nunca es lo que se quiere.
+
+Uso desde la terminal (por ejemplo, un cruce por estudiante):
+
+    python cruce.py admision.csv ola1.csv ola2.csv salida.csv --clave clave_estudiante --texto --how outer
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from validacion import BYTES_MUESTRA, detectar_formato
+
+# Valores de la columna indicadora del cruce (igual que pd.merge(indicator=True))
+COL_ORIGEN = "_origen"
+ORIGEN_AMBOS = "ambos"
+ORIGEN_IZQUIERDA = "solo_izquierda"
+ORIGEN_DERECHA = "solo_derecha"
+
+# Columna con el nombre del archivo cuando un lado tiene varios archivos (olas)
+COL_ARCHIVO = "archivo_origen"
+
+FILAS_POR_BLOQUE = 100_000
+
+# Filas acumuladas en memoria antes de escribir las particiones a disco
+# (también es el máximo de filas de cada trozo de partición)
+FILAS_EN_BUFFER = 500_000
+
+# Filas del lado más chico que se cargan a la vez al cruzar una partición
+FILAS_MAX_CONSTRUCCION = 1_000_000
+
+# Filas máximas de cada DataFrame que entrega el cruce
+FILAS_POR_SALIDA = 500_000
+
+
+class DiagnosticoCruce:
+    """Conteos de un cruce: qué calzó, qué no y qué venía sin clave."""
+
+    def __init__(self):
+        self.filas_ambos = 0
+        self.filas_solo_izquierda = 0
+        self.filas_solo_derecha = 0
+        self.sin_clave_izquierda = 0
+        self.sin_clave_derecha = 0
+        self.claves_solo_izquierda = 0
+        self.claves_solo_derecha = 0
+
+    def sumar(self, otro: "DiagnosticoCruce"):
+        for atributo, valor in vars(otro).items():
+            setattr(self, atributo, getattr(self, atributo) + valor)
+
+    def como_dict(self) -> dict:
+        return dict(vars(self))
+
+    def resumen(self) -> str:
+        return (
+            f"Filas cruzadas: {self.filas_ambos}. "
+            f"Solo en la base izquierda: {self.filas_solo_izquierda} "
+            f"({self.claves_solo_izquierda} clave(s)). "
+            f"Solo en la base derecha: {self.filas_solo_derecha} "
+            f"({self.claves_solo_derecha} clave(s)). "
+            f"Sin clave: {self.sin_clave_izquierda} izquierda, {self.sin_clave_derecha} derecha."
+        )
+
+
+def normalizar_clave(valores, clave_numerica: bool = True) -> np.ndarray:
+    """
+    Deja la clave en un tipo comparable entre ambas bases: float64 para
+    códigos (3309, 3309.0 y "3309" son lo mismo) o texto para claves de
+    estudiante. Los vacíos quedan como NaN / None.
+    """
+    serie = pd.Series(valores)
+    if clave_numerica:
+        return pd.to_numeric(serie, errors="coerce").to_numpy(dtype=float)
+    texto = serie.astype(str).to_numpy(dtype=object)
+    texto[serie.isna().to_numpy()] = None
+    return texto
+
+
+def _vacias(claves: np.ndarray) -> np.ndarray:
+    if claves.dtype == object:
+        return pd.isna(claves)
+    return np.isnan(claves)
+
+
+class _Emparejamiento:
+    """
+    Qué filas de dos lados calzan por clave, sin armar todavía los pares.
+
+    Cada lado se ordena por clave y se divide en bloques de claves iguales;
+    los pares de un bloque común son su producto cartesiano, que se genera
+    por tramos con `pares()`.
+    """
+
+    def __init__(self, kl: np.ndarray, kr: np.ndarray):
+        self.vacia_l, self.vacia_r = _vacias(kl), _vacias(kr)
+
+        # Ordenar cada lado por clave (solo las filas con clave)
+        filas_l = np.flatnonzero(~self.vacia_l)
+        filas_r = np.flatnonzero(~self.vacia_r)
+        self.filas_l = filas_l[np.argsort(kl[filas_l], kind="stable")]
+        self.filas_r = filas_r[np.argsort(kr[filas_r], kind="stable")]
+
+        # Bloques de claves iguales en cada lado: inicio y largo de cada bloque
+        self.claves_l, inicio_l, cuenta_l = np.unique(kl[self.filas_l], return_index=True, return_counts=True)
+        self.claves_r, inicio_r, cuenta_r = np.unique(kr[self.filas_r], return_index=True, return_counts=True)
+        _, a, b = np.intersect1d(self.claves_l, self.claves_r, assume_unique=True, return_indices=True)
+
+        self._inicio_l, self._inicio_r = inicio_l[a], inicio_r[b]
+        self._cuenta_r = cuenta_r[b]
+        self._pares_por_bloque = cuenta_l[a] * cuenta_r[b]
+        self._fin_bloque = np.cumsum(self._pares_por_bloque)
+        self.total_pares = int(self._fin_bloque[-1]) if len(a) else 0
+
+        # Filas de cada lado cuya clave está en el otro
+        comun_l = np.zeros(len(self.claves_l), dtype=bool)
+        comun_l[a] = True
+        comun_r = np.zeros(len(self.claves_r), dtype=bool)
+        comun_r[b] = True
+        self.calza_l = np.zeros(len(kl), dtype=bool)
+        self.calza_l[self.filas_l] = np.repeat(comun_l, cuenta_l)
+        self.calza_r = np.zeros(len(kr), dtype=bool)
+        self.calza_r[self.filas_r] = np.repeat(comun_r, cuenta_r)
+
+    def pares(self, max_pares: int):
+        """Índices (idx_l, idx_r) de los pares que calzan, en tramos de a lo más max_pares."""
+        for inicio in range(0, self.total_pares, max_pares):
+            posicion = np.arange(inicio, min(inicio + max_pares, self.total_pares))
+            bloque = np.searchsorted(self._fin_bloque, posicion, side="right")
+            en_bloque = posicion - (self._fin_bloque[bloque] - self._pares_por_bloque[bloque])
+            cuenta_r = self._cuenta_r[bloque]
+            yield (
+                self.filas_l[self._inicio_l[bloque] + en_bloque // cuenta_r],
+                self.filas_r[self._inicio_r[bloque] + en_bloque % cuenta_r],
+            )
+
+
+def _columnas_salida(columnas_izq: list, columnas_der: list, col_izq: str, col_der: str) -> tuple:
+    """Columnas del resultado y nombres nuevos del lado derecho (sufijo _der si se repiten)."""
+    der = [c for c in columnas_der if not (c == col_der and col_der == col_izq)]
+    renombrar = {c: f"{c}_der" for c in der if c in columnas_izq}
+    return columnas_izq + [renombrar.get(c, c) for c in der] + [COL_ORIGEN], renombrar
+
+
+def _filas_ambos(df_izq, df_der, idx_l, idx_r, col_izq, col_der, renombrar) -> pd.DataFrame:
+    der = df_der.drop(columns=[col_der]) if col_der == col_izq else df_der
+    return pd.concat([
+        df_izq.iloc[idx_l].reset_index(drop=True),
+        der.iloc[idx_r].reset_index(drop=True).rename(columns=renombrar),
+    ], axis=1).assign(**{COL_ORIGEN: ORIGEN_AMBOS})
+
+
+def _filas_solo_izquierda(df_izq, filas) -> pd.DataFrame:
+    return df_izq.iloc[filas].reset_index(drop=True).assign(**{COL_ORIGEN: ORIGEN_IZQUIERDA})
+
+
+def _filas_solo_derecha(df_der, filas, col_izq, col_der, renombrar) -> pd.DataFrame:
+    solo = df_der.iloc[filas].reset_index(drop=True).rename(columns=renombrar)
+    if col_der == col_izq:
+        # La clave va en la columna de la izquierda, como en pd.merge
+        solo = solo.rename(columns={col_der: col_izq})
+    return solo.assign(**{COL_ORIGEN: ORIGEN_DERECHA})
+
+
+def unir_ordenado(
+    df_izq: pd.DataFrame,
+    df_der: pd.DataFrame,
+    col_izq: str,
+    col_der: str | None = None,
+    how: str = "inner",
+    clave_numerica: bool = True,
+) -> tuple:
+    """
+    Sort-merge join en memoria, para bases que caben completas (por ejemplo,
+    agregados por carrera). Para archivos grandes usar cruzar_archivos.
+
+    how: "inner", "left", "right" u "outer". Agrega la columna "_origen"
+    (ambos / solo_izquierda / solo_derecha). Las filas sin clave nunca
+    calzan; en cruces externos se conservan como "solo_...".
+    Devuelve (df_unido, DiagnosticoCruce).
+    """
+    col_der = col_der or col_izq
+    columnas, renombrar = _columnas_salida(list(df_izq.columns), list(df_der.columns), col_izq, col_der)
+
+    emparejamiento = _Emparejamiento(
+        normalizar_clave(df_izq[col_izq], clave_numerica),
+        normalizar_clave(df_der[col_der], clave_numerica),
+    )
+    solo_l = np.flatnonzero(~emparejamiento.calza_l)
+    solo_r = np.flatnonzero(~emparejamiento.calza_r)
+
+    partes = [
+        _filas_ambos(df_izq, df_der, idx_l, idx_r, col_izq, col_der, renombrar)
+        for idx_l, idx_r in emparejamiento.pares(max(emparejamiento.total_pares, 1))
+    ]
+    if how in ("left", "outer") and len(solo_l):
+        partes.append(_filas_solo_izquierda(df_izq, solo_l))
+    if how in ("right", "outer") and len(solo_r):
+        partes.append(_filas_solo_derecha(df_der, solo_r, col_izq, col_der, renombrar))
+
+    diag = DiagnosticoCruce()
+    diag.filas_ambos = emparejamiento.total_pares
+    diag.sin_clave_izquierda = int(emparejamiento.vacia_l.sum())
+    diag.sin_clave_derecha = int(emparejamiento.vacia_r.sum())
+    diag.filas_solo_izquierda = len(solo_l) - diag.sin_clave_izquierda
+    diag.filas_solo_derecha = len(solo_r) - diag.sin_clave_derecha
+    diag.claves_solo_izquierda = int((~np.isin(emparejamiento.claves_l, emparejamiento.claves_r)).sum())
+    diag.claves_solo_derecha = int((~np.isin(emparejamiento.claves_r, emparejamiento.claves_l)).sum())
+
+    unido = pd.concat(partes, ignore_index=True) if partes else pd.DataFrame()
+    return unido.reindex(columns=columnas), diag
+
+
+def _como_lista(rutas) -> list:
+    return [rutas] if isinstance(rutas, (str, os.PathLike)) else list(rutas)
+
+
+def _leer_bloques(rutas, transformar=None):
+    """
+    Bloques de FILAS_POR_BLOQUE filas de uno o más CSV (detectando el formato
+    de cada uno). Con varios archivos se agrega COL_ARCHIVO a cada bloque.
+    Los archivos pueden tener columnas distintas (una ola con una pregunta
+    nueva); cada bloque trae solo las de su archivo. Si no hay filas, entrega
+    un único bloque vacío con las columnas de todos los archivos.
+    """
+    rutas = _como_lista(rutas)
+    hubo_filas = False
+    encabezados = []
+    for ruta in rutas:
+        with open(ruta, "rb") as f:
+            formato = detectar_formato(f.read(BYTES_MUESTRA))
+        encabezados.append(pd.read_csv(ruta, nrows=0, **formato))
+
+        for bloque in pd.read_csv(ruta, chunksize=FILAS_POR_BLOQUE, **formato):
+            if transformar is not None:
+                bloque = transformar(bloque)
+            if len(rutas) > 1:
+                bloque[COL_ARCHIVO] = os.path.basename(ruta)
+            hubo_filas = True
+            yield bloque
+
+    if not hubo_filas:
+        vacio = pd.concat(encabezados)
+        if transformar is not None:
+            vacio = transformar(vacio)
+        if len(rutas) > 1:
+            vacio[COL_ARCHIVO] = pd.Series(dtype=object)
+        yield vacio
+
+
+def particionar(
+    rutas,
+    col_clave: str,
+    carpeta: str,
+    n_particiones: int,
+    transformar=None,
+    clave_numerica: bool = True,
+) -> tuple:
+    """
+    Lee uno o más CSV por bloques y reparte las filas en n_particiones según
+    el hash de la clave. `transformar(bloque)` permite, por ejemplo, traducir
+    códigos o quedarse con menos columnas antes de particionar.
+
+    Devuelve (trozos, columnas): para cada partición, la lista de
+    (archivo, n_filas) que la componen, cada uno de a lo más FILAS_EN_BUFFER
+    filas; y las columnas de la base, que son la unión de las de todos los
+    archivos en orden de aparición (a las filas de un archivo sin alguna de
+    ellas les queda vacía). Las filas sin clave van a una partición extra
+    (la última).
+    """
+    os.makedirs(carpeta, exist_ok=True)
+    trozos = [[] for _ in range(n_particiones + 1)]
+    buffer = [[] for _ in range(n_particiones + 1)]
+    filas_en_buffer = 0
+    columnas = {}
+
+    def vaciar():
+        for p, bloques in enumerate(buffer):
+            if bloques:
+                ruta = os.path.join(carpeta, f"p{p}_{len(trozos[p])}.pkl")
+                trozo = pd.concat(bloques, ignore_index=True)
+                trozo.to_pickle(ruta)
+                trozos[p].append((ruta, len(trozo)))
+                bloques.clear()
+
+    for bloque in _leer_bloques(rutas, transformar):
+        columnas.update(dict.fromkeys(bloque.columns))
+
+        claves = normalizar_clave(bloque[col_clave], clave_numerica)
+        vacias = _vacias(claves)
+        particion = np.full(len(bloque), n_particiones, dtype=np.int64)
+        if (~vacias).any():
+            hashes = pd.util.hash_array(claves[~vacias])
+            particion[~vacias] = (hashes % np.uint64(n_particiones)).astype(np.int64)
+
+        # Agrupar el bloque por partición con un solo ordenamiento
+        orden = np.argsort(particion, kind="stable")
+        cortes = np.searchsorted(particion[orden], np.arange(n_particiones + 2))
+        for p in range(n_particiones + 1):
+            if cortes[p + 1] > cortes[p]:
+                buffer[p].append(bloque.iloc[orden[cortes[p]:cortes[p + 1]]])
+
+        filas_en_buffer += len(bloque)
+        if filas_en_buffer >= FILAS_EN_BUFFER:
+            vaciar()
+            filas_en_buffer = 0
+
+    vaciar()
+    if COL_ARCHIVO in columnas:
+        # Al final, después de las columnas que solo traen las olas posteriores
+        columnas[COL_ARCHIVO] = columnas.pop(COL_ARCHIVO)
+    return trozos, list(columnas)
+
+
+def _rebanadas(trozos: list, max_filas: int):
+    """Agrupa trozos consecutivos en rebanadas de a lo más max_filas filas (o un trozo)."""
+    rebanada, filas = [], 0
+    for ruta, n in trozos:
+        if rebanada and filas + n > max_filas:
+            yield rebanada
+            rebanada, filas = [], 0
+        rebanada.append(ruta)
+        filas += n
+    if rebanada:
+        yield rebanada
+
+
+def _leer_trozos(rutas: list) -> pd.DataFrame:
+    return pd.concat([pd.read_pickle(r) for r in rutas], ignore_index=True)
+
+
+def _sin_par(df, filas, del_lado_izq, col_izq, col_der, columnas, renombrar):
+    """Filas sin par de un lado, en tramos de a lo más FILAS_POR_SALIDA."""
+    for inicio in range(0, len(filas), FILAS_POR_SALIDA):
+        tramo = filas[inicio:inicio + FILAS_POR_SALIDA]
+        if del_lado_izq:
+            yield _filas_solo_izquierda(df, tramo).reindex(columns=columnas)
+        else:
+            yield _filas_solo_derecha(df, tramo, col_izq, col_der, renombrar).reindex(columns=columnas)
+
+
+def _cruzar_particion(trozos_izq, trozos_der, col_izq, col_der, how, clave_numerica, columnas, renombrar, diag):
+    """
+    Cruza una partición. El lado con menos filas se carga por rebanadas; cada
+    trozo del otro lado se cruza contra cada rebanada. Las marcas de "calzó"
+    del lado recorrido se guardan por fila (un byte por fila) para entregar
+    al final las filas sin par.
+    """
+    filas_izq = sum(n for _, n in trozos_izq)
+    filas_der = sum(n for _, n in trozos_der)
+    construye_izq = filas_izq <= filas_der
+    trozos_c, trozos_r = (trozos_izq, trozos_der) if construye_izq else (trozos_der, trozos_izq)
+    col_c, col_r = (col_izq, col_der) if construye_izq else (col_der, col_izq)
+
+    entrega_izq = how in ("left", "outer")
+    entrega_der = how in ("right", "outer")
+    entrega_c, entrega_r = (entrega_izq, entrega_der) if construye_izq else (entrega_der, entrega_izq)
+
+    calza_r = [np.zeros(n, dtype=bool) for _, n in trozos_r]
+    claves_sin_par_c, claves_sin_par_r = [], []
+    filas_sin_par_c = filas_sin_par_r = 0
+
+    for rebanada in _rebanadas(trozos_c, FILAS_MAX_CONSTRUCCION):
+        df_c = _leer_trozos(rebanada)
+        k_c = normalizar_clave(df_c[col_c], clave_numerica)
+        calza_c = np.zeros(len(df_c), dtype=bool)
+
+        for j, (ruta, _) in enumerate(trozos_r):
+            df_r = pd.read_pickle(ruta)
+            k_r = normalizar_clave(df_r[col_r], clave_numerica)
+
+            if construye_izq:
+                emparejamiento = _Emparejamiento(k_c, k_r)
+                calza_c |= emparejamiento.calza_l
+                calza_r[j] |= emparejamiento.calza_r
+                df_izq, df_der = df_c, df_r
+            else:
+                emparejamiento = _Emparejamiento(k_r, k_c)
+                calza_c |= emparejamiento.calza_r
+                calza_r[j] |= emparejamiento.calza_l
+                df_izq, df_der = df_r, df_c
+
+            diag.filas_ambos += emparejamiento.total_pares
+            for idx_l, idx_r in emparejamiento.pares(FILAS_POR_SALIDA):
+                yield _filas_ambos(df_izq, df_der, idx_l, idx_r, col_izq, col_der, renombrar).reindex(columns=columnas)
+
+        filas = np.flatnonzero(~calza_c)
+        filas_sin_par_c += len(filas)
+        claves_sin_par_c.append(np.unique(k_c[filas]))
+        if entrega_c:
+            yield from _sin_par(df_c, filas, construye_izq, col_izq, col_der, columnas, renombrar)
+
+    for (ruta, _), calza in zip(trozos_r, calza_r):
+        filas = np.flatnonzero(~calza)
+        filas_sin_par_r += len(filas)
+        if len(filas):
+            df_r = pd.read_pickle(ruta)
+            claves_sin_par_r.append(np.unique(normalizar_clave(df_r[col_r].iloc[filas], clave_numerica)))
+            if entrega_r:
+                yield from _sin_par(df_r, filas, not construye_izq, col_izq, col_der, columnas, renombrar)
+
+    # Claves sin par: cada lado puede repetir una clave en varios trozos o rebanadas
+    claves_c = len(np.unique(np.concatenate(claves_sin_par_c))) if claves_sin_par_c else 0
+    claves_r = len(np.unique(np.concatenate(claves_sin_par_r))) if claves_sin_par_r else 0
+    if construye_izq:
+        diag.filas_solo_izquierda += filas_sin_par_c
+        diag.filas_solo_derecha += filas_sin_par_r
+        diag.claves_solo_izquierda += claves_c
+        diag.claves_solo_derecha += claves_r
+    else:
+        diag.filas_solo_izquierda += filas_sin_par_r
+        diag.filas_solo_derecha += filas_sin_par_c
+        diag.claves_solo_izquierda += claves_r
+        diag.claves_solo_derecha += claves_c
+
+
+def cruzar_archivos(
+    rutas_izq,
+    rutas_der,
+    col_izq: str,
+    col_der: str | None = None,
+    how: str = "inner",
+    n_particiones: int = 16,
+    transformar_izq=None,
+    transformar_der=None,
+    clave_numerica: bool = True,
+    carpeta_temporal: str | None = None,
+):
+    """
+    Cruce fuera de memoria entre dos bases, cada una de uno o más CSV (por
+    ejemplo, varias olas de la encuesta a la derecha). Es un generador:
+    entrega DataFrames de a lo más FILAS_POR_SALIDA filas, todos con las
+    mismas columnas, y al final devuelve el DiagnosticoCruce total,
+    disponible como el valor de StopIteration o usando `cruzar_a_csv`.
+
+    Sirve para cruces por código o, con clave_numerica=False, por una clave
+    de estudiante común a ambas bases.
+    """
+    col_der = col_der or col_izq
+    carpeta = tempfile.mkdtemp(prefix="cruce_", dir=carpeta_temporal)
+    diag = DiagnosticoCruce()
+
+    try:
+        trozos_izq, columnas_izq = particionar(
+            rutas_izq, col_izq, os.path.join(carpeta, "izq"), n_particiones, transformar_izq, clave_numerica
+        )
+        trozos_der, columnas_der = particionar(
+            rutas_der, col_der, os.path.join(carpeta, "der"), n_particiones, transformar_der, clave_numerica
+        )
+        columnas, renombrar = _columnas_salida(columnas_izq, columnas_der, col_izq, col_der)
+
+        for p in range(n_particiones):
+            yield from _cruzar_particion(
+                trozos_izq[p], trozos_der[p], col_izq, col_der, how, clave_numerica, columnas, renombrar, diag
+            )
+
+        # Filas sin clave: nunca calzan
+        for ruta, n in trozos_izq[n_particiones]:
+            diag.sin_clave_izquierda += n
+            if how in ("left", "outer"):
+                yield from _sin_par(pd.read_pickle(ruta), np.arange(n), True, col_izq, col_der, columnas, renombrar)
+        for ruta, n in trozos_der[n_particiones]:
+            diag.sin_clave_derecha += n
+            if how in ("right", "outer"):
+                yield from _sin_par(pd.read_pickle(ruta), np.arange(n), False, col_izq, col_der, columnas, renombrar)
+    finally:
+        shutil.rmtree(carpeta, ignore_errors=True)
+
+    return diag
+
+
+def agregar_por_bloques(
+    rutas,
+    col_clave: str,
+    promedios: dict,
+    col_conteo: str,
+    transformar=None,
+) -> pd.DataFrame:
+    """
+    Promedios por clave (ej. por carrera) de uno o más CSV leídos por
+    bloques: de cada bloque solo se guardan sumas y conteos por clave, así la
+    memoria depende del número de claves y no del número de filas.
+
+    promedios: {columna_salida: columna_origen}. col_conteo: nombre de la
+    columna de salida con la cantidad de filas por clave. Si un archivo no
+    tiene alguna de las columnas, sus filas solo cuentan en las demás.
+    """
+    columnas = list(dict.fromkeys(promedios.values()))
+    parciales = []
+    for bloque in _leer_bloques(rutas, transformar):
+        grupos = bloque.reindex(columns=[col_clave, *columnas]).groupby(col_clave)
+        parcial = grupos[columnas].sum(min_count=1).add_suffix("__suma")
+        parcial = parcial.join(grupos[columnas].count().add_suffix("__n"))
+        parcial[col_conteo] = grupos.size()
+        parciales.append(parcial)
+
+    total = pd.concat(parciales).groupby(level=0).sum(min_count=1)
+    resultado = pd.DataFrame(index=total.index)
+    for salida, origen in promedios.items():
+        resultado[salida] = total[f"{origen}__suma"] / total[f"{origen}__n"]
+    resultado[col_conteo] = total[col_conteo].fillna(0).astype(int)
+    return resultado.rename_axis(col_clave).reset_index()
+
+
+def cruzar_a_csv(ruta_salida: str, *args, **kwargs) -> DiagnosticoCruce:
+    """Ejecuta cruzar_archivos escribiendo cada parte al CSV de salida."""
+    generador = cruzar_archivos(*args, **kwargs)
+    primero = True
+    while True:
+        try:
+            parte = next(generador)
+        except StopIteration as fin:
+            return fin.value
+        parte.to_csv(ruta_salida, mode="w" if primero else "a", header=primero, index=False)
+        primero = False
+
+
+def _valor_opcion(argumentos: list, nombre: str, defecto=None):
+    if nombre in argumentos:
+        i = argumentos.index(nombre)
+        valor = argumentos[i + 1]
+        del argumentos[i:i + 2]
+        return valor
+    return defecto
+
+
+if __name__ == "__main__":
+    argumentos = sys.argv[1:]
+    clave = _valor_opcion(argumentos, "--clave")
+    clave_der = _valor_opcion(argumentos, "--clave-der")
+    tipo = _valor_opcion(argumentos, "--how", "inner")
+    texto = "--texto" in argumentos
+    if texto:
+        argumentos.remove("--texto")
+
+    if clave is None or len(argumentos) < 3:
+        print(__doc__)
+        sys.exit(1)
+
+    *rutas_der, salida = argumentos[1:]
+    diagnostico = cruzar_a_csv(
+        salida, argumentos[0], rutas_der, clave, clave_der, how=tipo, clave_numerica=not texto
+    )
+    print(diagnostico.resumen())
@@ -0,0 +1,234 @@
+import datetime
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from alertas import NIVELES_ALERTA
+
+# Carpeta donde se guardan las olas entre sesiones (una subcarpeta por secreto)
+CARPETA_OLAS = ".olas_seguimiento"
+ARCHIVO_INDICE = "indice.json"
+
+
+class AlmacenOlas:
+    """
+    Guarda los resultados de cada ola de la encuesta (una aplicación de
+    calcular_alertas) indexados por una clave seudónima de estudiante, para
+    poder comparar olas sin volver a cruzar DataFrames completos.
+
+    Cada ola se guarda como arreglos NumPy ordenados por el hash de la clave,
+    de modo que el cruce entre dos olas es un merge de listas ordenadas
+    (np.searchsorted) y no un pd.merge. Los cruces y las matrices de
+    transición se guardan en caché por par de olas.
+
+    Sin `carpeta`, el almacén vive solo en memoria. Con `carpeta`, las olas
+    registradas con guardar_ola se escriben en disco (un .npz por ola, con
+    la huella de su contenido como nombre, más un índice JSON) y se vuelven
+    a encontrar al crear el almacén con la misma carpeta en otra sesión.
+    """
+
+    def __init__(self, carpeta: str | None = None):
+        self.carpeta = carpeta
+        self._info = {}
+        self._olas = {}
+        self._cache_cruces = {}
+        self._cache_matrices = {}
+
+        if carpeta is not None:
+            ruta_indice = os.path.join(carpeta, ARCHIVO_INDICE)
+            if os.path.exists(ruta_indice):
+                with open(ruta_indice, encoding="utf-8") as f:
+                    self._info = json.load(f)
+
+    @property
+    def olas(self) -> list:
+        return list(self._info)
+
+    def info(self, nombre: str) -> dict:
+        """Etiqueta, columna clave, cantidad de estudiantes y fecha (si se guardó) de la ola."""
+        return dict(self._info[nombre])
+
+    def agregar_ola(self, nombre: str, df_resultado: pd.DataFrame, col_clave: str, etiqueta: str | None = None):
+        """
+        Registra (o reemplaza) una ola en memoria a partir de la salida de
+        calcular_alertas.
+
+        Si una clave aparece más de una vez en la ola se conserva la última respuesta.
+        Las filas sin clave se descartan.
+        """
+        arreglos = self._preparar(nombre, df_resultado, col_clave)
+        self._olas[nombre] = arreglos
+        self._info[nombre] = {
+            "etiqueta": etiqueta or nombre,
+            "columna_clave": col_clave,
+            "estudiantes": len(arreglos["hash"]),
+        }
+        self._invalidar(nombre)
+
+    def guardar_ola(self, df_resultado: pd.DataFrame, col_clave: str, etiqueta: str) -> str:
+        """
+        Registra una ola y la guarda en la carpeta del almacén. Su nombre es la
+        huella (BLAKE2) de su contenido: volver a guardar la misma ola no la
+        duplica. Devuelve ese nombre.
+        """
+        if self.carpeta is None:
+            raise ValueError("El almacén no tiene carpeta: use agregar_ola para guardarla solo en memoria.")
+
+        arreglos = self._preparar(etiqueta, df_resultado, col_clave)
+        h = hashlib.blake2b(col_clave.encode("utf-8"), digest_size=16)
+        for nombre_arreglo in ("hash", "puntaje", "nivel"):
+            h.update(arreglos[nombre_arreglo].tobytes())
+        huella = h.hexdigest()
+
+        if huella not in self._info:
+            os.makedirs(self.carpeta, exist_ok=True)
+            # Las claves se guardan como texto de NumPy para leerlas sin pickle
+            np.savez(
+                os.path.join(self.carpeta, f"{huella}.npz"),
+                **{**arreglos, "clave": np.asarray(arreglos["clave"], dtype=str)},
+            )
+            self._olas[huella] = arreglos
+            self._info[huella] = {
+                "etiqueta": etiqueta,
+                "columna_clave": col_clave,
+                "estudiantes": len(arreglos["hash"]),
+                "guardada": datetime.date.today().isoformat(),
+            }
+            self._escribir_indice()
+        return huella
+
+    def _preparar(self, nombre: str, df_resultado: pd.DataFrame, col_clave: str) -> dict:
+        """Arreglos de la ola ordenados por el hash de la clave (una fila por estudiante)."""
+        faltantes = [c for c in (col_clave, "reprob_predicha", "nivel_alerta") if c not in df_resultado.columns]
+        if faltantes:
+            raise ValueError(f"La ola '{nombre}' no tiene las columnas necesarias. Faltan: {faltantes}")
+
+        df = df_resultado[[col_clave, "reprob_predicha", "nivel_alerta"]].dropna(subset=[col_clave])
+        claves = df[col_clave].astype(str).to_numpy()
+
+        # Hash de 64 bits de cada clave: el orden y la búsqueda se hacen sobre enteros
+        hashes = pd.util.hash_array(claves.astype(object))
+
+        # Orden estable + quedarse con la última aparición de cada hash
+        orden = np.argsort(hashes, kind="stable")
+        hashes = hashes[orden]
+        ultimo = np.ones(len(hashes), dtype=bool)
+        ultimo[:-1] = hashes[1:] != hashes[:-1]
+        orden = orden[ultimo]
+
+        niveles = pd.Categorical(df["nivel_alerta"], categories=NIVELES_ALERTA).codes
+
+        return {
+            "hash": hashes[ultimo],
+            "clave": claves[orden],
+            "puntaje": df["reprob_predicha"].to_numpy(dtype=float)[orden],
+            "nivel": niveles[orden].astype(np.int8),
+        }
+
+    def quitar_ola(self, nombre: str):
+        """Quita la ola del almacén (y de la carpeta, si estaba guardada)."""
+        self._olas.pop(nombre, None)
+        info = self._info.pop(nombre, None)
+        if info is not None and "guardada" in info:
+            ruta = os.path.join(self.carpeta, f"{nombre}.npz")
+            if os.path.exists(ruta):
+                os.remove(ruta)
+            self._escribir_indice()
+        self._invalidar(nombre)
+
+    def _escribir_indice(self):
+        guardadas = {nombre: info for nombre, info in self._info.items() if "guardada" in info}
+        with open(os.path.join(self.carpeta, ARCHIVO_INDICE), "w", encoding="utf-8") as f:
+            json.dump(guardadas, f, ensure_ascii=False, indent=2)
+
+    def _ola(self, nombre: str) -> dict:
+        """Arreglos de la ola; las guardadas en otra sesión se leen de disco la primera vez."""
+        if nombre not in self._olas:
+            with np.load(os.path.join(self.carpeta, f"{nombre}.npz")) as datos:
+                self._olas[nombre] = {k: datos[k] for k in datos.files}
+        return self._olas[nombre]
+
+    def _invalidar(self, nombre: str):
+        """Borra de la caché los cruces donde participaba la ola."""
+        for cache in (self._cache_cruces, self._cache_matrices):
+            for par in [p for p in cache if nombre in p]:
+                del cache[par]
+
+    def _cruce(self, ola_a: str, ola_b: str):
+        """
+        Índices (i_a, i_b) de los estudiantes presentes en ambas olas.
+        Ambas olas ya están ordenadas por hash, así que basta un searchsorted.
+        """
+        par = (ola_a, ola_b)
+        if par not in self._cache_cruces:
+            a = self._ola(ola_a)["hash"]
+            b = self._ola(ola_b)["hash"]
+
+            if len(b) == 0:
+                coincide = np.zeros(len(a), dtype=bool)
+                pos = np.zeros(len(a), dtype=np.intp)
+            else:
+                pos = np.searchsorted(b, a)
+                coincide = b[np.minimum(pos, len(b) - 1)] == a
+
+            self._cache_cruces[par] = (np.flatnonzero(coincide), pos[coincide])
+        return self._cache_cruces[par]
+
+    def matriz_transicion(self, ola_a: str, ola_b: str) -> pd.DataFrame:
+        """
+        Cantidad de estudiantes que pasan de cada nivel de alerta en ola_a
+        (filas) a cada nivel en ola_b (columnas).
+        Los estudiantes sin nivel válido en alguna de las olas no se cuentan.
+        """
+        par = (ola_a, ola_b)
+        if par not in self._cache_matrices:
+            i_a, i_b = self._cruce(ola_a, ola_b)
+            nivel_a = self._ola(ola_a)["nivel"][i_a]
+            nivel_b = self._ola(ola_b)["nivel"][i_b]
+
+            validos = (nivel_a >= 0) & (nivel_b >= 0)
+            n = len(NIVELES_ALERTA)
+            conteos = np.bincount(
+                nivel_a[validos].astype(np.intp) * n + nivel_b[validos],
+                minlength=n * n,
+            ).reshape(n, n)
+
+            self._cache_matrices[par] = pd.DataFrame(
+                conteos,
+                index=pd.Index(NIVELES_ALERTA, name=ola_a),
+                columns=pd.Index(NIVELES_ALERTA, name=ola_b),
+            )
+        return self._cache_matrices[par].copy()
+
+    def deltas(self, ola_a: str, ola_b: str) -> pd.DataFrame:
+        """
+        Cambio de puntaje y de nivel por estudiante entre dos olas.
+        Solo incluye a los estudiantes presentes en ambas.
+        """
+        i_a, i_b = self._cruce(ola_a, ola_b)
+        a = self._ola(ola_a)
+        b = self._ola(ola_b)
+        categorias = np.array(NIVELES_ALERTA + [None], dtype=object)
+
+        return pd.DataFrame({
+            "clave": a["clave"][i_a],
+            "puntaje_inicial": a["puntaje"][i_a],
+            "puntaje_final": b["puntaje"][i_b],
+            "delta_puntaje": b["puntaje"][i_b] - a["puntaje"][i_a],
+            "nivel_inicial": categorias[a["nivel"][i_a]],
+            "nivel_final": categorias[b["nivel"][i_b]],
+            "delta_nivel": b["nivel"][i_b].astype(int) - a["nivel"][i_a].astype(int),
+        })
+
+    def empeoraron(self, ola_a: str, ola_b: str) -> pd.DataFrame:
+        """Estudiantes que subieron de nivel de alerta, del mayor al menor aumento de puntaje."""
+        i_a, i_b = self._cruce(ola_a, ola_b)
+        nivel_a = self._ola(ola_a)["nivel"][i_a]
+        nivel_b = self._ola(ola_b)["nivel"][i_b]
+        subio = (nivel_a >= 0) & (nivel_b > nivel_a)
+
+        df = self.deltas(ola_a, ola_b)[subio]
+        return df.sort_values("delta_puntaje", ascending=False).reset_index(drop=True)
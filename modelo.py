@@ -0,0 +1,244 @@
+"""
+Modelo de riesgo aprendido (regresión logística en NumPy) como alternativa
+a la fórmula lineal fija de alertas.puntaje_lineal.
+
+Uso desde la terminal (reentrena, valida y guarda los coeficientes):
+
+    python modelo.py "Cuestionario motivacion academica.csv"
+"""
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from alertas import puntaje_lineal, verificar_columnas
+from privacidad import COL_CLAVE, COLUMNAS_IDENTIFICADORAS, CUASI_IDENTIFICADORES
+from validacion import REGLAS_ENCUESTA, buscar_columna
+
+# Etiquetas de resultado que trae la encuesta
+COL_PIENSA_ABANDONAR = "Estoy pensando seriamente en abandonar mi carrera o cambiarme a otra pronto"
+COL_DECIDIO_ABANDONAR = "Ya decidí abandonar mi carrera o cambiarme a otra pronto"
+
+# Desde este valor (escala 1 a 5) se considera que el estudiante piensa en abandonar
+UMBRAL_PIENSA_ABANDONAR = 4
+
+# Columnas que no se usan como variables del modelo: las etiquetas, y todo lo
+# que la seudonimización elimina o generaliza antes de puntuar (identificadores,
+# clave seudónima y cuasi-identificadores, como el año de matrícula)
+COLUMNAS_EXCLUIDAS = (
+    COL_PIENSA_ABANDONAR,
+    COL_DECIDIO_ABANDONAR,
+    *CUASI_IDENTIFICADORES,
+    *COLUMNAS_IDENTIFICADORAS,
+    COL_CLAVE,
+    "reprob_predicha",
+)
+
+ARCHIVO_MODELO = "modelo_riesgo.json"
+
+
+def construir_etiqueta(df: pd.DataFrame) -> np.ndarray:
+    """1 si el estudiante piensa seriamente en abandonar o ya lo decidió."""
+    verificar_columnas(df, (COL_PIENSA_ABANDONAR, COL_DECIDIO_ABANDONAR))
+    piensa = pd.to_numeric(df[COL_PIENSA_ABANDONAR], errors="coerce") >= UMBRAL_PIENSA_ABANDONAR
+    decidio = df[COL_DECIDIO_ABANDONAR].astype(str).str.strip().str.lower().isin(["sí", "si"])
+    return (piensa | decidio).to_numpy(dtype=float)
+
+
+def columnas_variables(df: pd.DataFrame) -> list:
+    """
+    Variables numéricas de la encuesta (escalas Likert, reprobadas, motivación).
+    Las columnas excluidas se reconocen igual que en la validación (sin
+    distinguir mayúsculas ni tildes, con texto agregado al final).
+    """
+    return [
+        c for c in df.columns
+        if pd.api.types.is_numeric_dtype(df[c])
+        and not any(buscar_columna(excluida, [c]) for excluida in COLUMNAS_EXCLUIDAS)
+    ]
+
+
+def _matriz(df: pd.DataFrame, columnas: list, relleno: np.ndarray) -> np.ndarray:
+    """Matriz de variables; los vacíos se rellenan con la media de entrenamiento."""
+    X = df[columnas].to_numpy(dtype=float)
+    vacios = np.isnan(X)
+    if vacios.any():
+        X[vacios] = np.broadcast_to(relleno, X.shape)[vacios]
+    return X
+
+
+def _ajustar_logistica(X: np.ndarray, y: np.ndarray, l2: float, iteraciones: int) -> np.ndarray:
+    """
+    Regresión logística con regularización L2 por Newton-Raphson (IRLS).
+    X ya viene estandarizada y con una columna de unos al final.
+    """
+    w = np.zeros(X.shape[1])
+    penalizacion = np.full(X.shape[1], l2)
+    penalizacion[-1] = 0.0  # el intercepto no se regulariza
+
+    for _ in range(iteraciones):
+        p = 1.0 / (1.0 + np.exp(-(X @ w)))
+        gradiente = X.T @ (p - y) + penalizacion * w
+        hessiano = (X * (p * (1 - p))[:, None]).T @ X + np.diag(penalizacion)
+        paso = np.linalg.solve(hessiano, gradiente)
+        w -= paso
+        if np.abs(paso).max() < 1e-8:
+            break
+    return w
+
+
+def entrenar_modelo(df: pd.DataFrame, l2: float = 1.0, iteraciones: int = 50) -> dict:
+    """
+    Ajusta el modelo sobre la encuesta y devuelve un dict serializable con
+    columnas, medias y coeficientes ya expresados en la escala original, más
+    el rango de cada columna en el entrenamiento (para validar los archivos).
+    """
+    y = construir_etiqueta(df)
+    columnas = columnas_variables(df)
+
+    X = df[columnas].to_numpy(dtype=float)
+    media = np.nanmean(X, axis=0)
+    X = _matriz(df, columnas, media)
+    escala = X.std(axis=0)
+    escala[escala == 0] = 1.0
+
+    Xs = np.column_stack([(X - media) / escala, np.ones(len(X))])
+    w = _ajustar_logistica(Xs, y, l2, iteraciones)
+
+    # Llevar los coeficientes a la escala original: z = X @ coef + intercepto
+    coef = w[:-1] / escala
+    intercepto = w[-1] - float(media @ coef)
+
+    observado = df[columnas].to_numpy(dtype=float)
+    enteras = np.all(np.isnan(observado) | (np.mod(observado, 1) == 0), axis=0)
+
+    return {
+        "tipo": "regresion_logistica",
+        "version": 2,
+        "columnas": columnas,
+        "media": media.tolist(),
+        # En las columnas enteras el rango se guarda como entero (así se reporta)
+        "minimo": [int(v) if e else float(v) for v, e in zip(np.nanmin(observado, axis=0), enteras)],
+        "maximo": [int(v) if e else float(v) for v, e in zip(np.nanmax(observado, axis=0), enteras)],
+        "entera": enteras.tolist(),
+        "coef": coef.tolist(),
+        "intercepto": float(intercepto),
+        "l2": l2,
+        "n_entrenamiento": int(len(y)),
+        "tasa_positivos": float(y.mean()) if len(y) else 0.0,
+    }
+
+
+def guardar_modelo(modelo: dict, ruta: str = ARCHIVO_MODELO):
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(modelo, f, ensure_ascii=False, indent=2)
+
+
+def cargar_modelo(ruta: str = ARCHIVO_MODELO) -> dict:
+    with open(ruta, encoding="utf-8") as f:
+        modelo = json.load(f)
+    modelo["_coef"] = np.asarray(modelo["coef"])
+    modelo["_media"] = np.asarray(modelo["media"])
+    return modelo
+
+
+def predecir_probabilidad(df: pd.DataFrame, modelo: dict) -> np.ndarray:
+    """Probabilidad estimada de abandono para cada fila (un solo producto matriz-vector)."""
+    verificar_columnas(df, modelo["columnas"])
+    coef = modelo.get("_coef", np.asarray(modelo["coef"]))
+    media = modelo.get("_media", np.asarray(modelo["media"]))
+
+    z = _matriz(df, modelo["columnas"], media) @ coef + modelo["intercepto"]
+    return 1.0 / (1.0 + np.exp(-z))
+
+
+def reglas_modelo(modelo: dict) -> list:
+    """
+    Reglas de validación para puntuar con el modelo: las de la encuesta más
+    una por cada otra columna del modelo, con el rango (y si es entera) que
+    tenía en el entrenamiento. En esas columnas se aceptan vacíos, porque el
+    modelo los rellena con la media.
+    """
+    reglas = list(REGLAS_ENCUESTA)
+    ya_incluidas = {r["columna"] for r in reglas}
+    for columna, minimo, maximo, entera in zip(
+        modelo["columnas"], modelo["minimo"], modelo["maximo"], modelo["entera"]
+    ):
+        if columna not in ya_incluidas:
+            reglas.append({
+                "columna": columna, "minimo": minimo, "maximo": maximo,
+                "entero": entera, "permite_vacio": True,
+            })
+    return reglas
+
+
+def puntaje_modelo(modelo: dict):
+    """
+    Función de puntaje para calcular_alertas(df, puntuar=...). El puntaje
+    es la probabilidad estimada de abandono.
+    """
+    def puntuar(df: pd.DataFrame) -> np.ndarray:
+        return predecir_probabilidad(df, modelo)
+
+    return puntuar
+
+
+def auc(y: np.ndarray, puntaje: np.ndarray) -> float:
+    """Área bajo la curva ROC (estadístico de Mann-Whitney, con empates promediados)."""
+    positivos = y == 1
+    n_pos, n_neg = positivos.sum(), (~positivos).sum()
+    if n_pos == 0 or n_neg == 0:
+        return float("nan")
+    rangos = pd.Series(puntaje).rank(method="average").to_numpy()
+    return float((rangos[positivos].sum() - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg))
+
+
+def _evaluar_pliegue(args) -> dict:
+    df, idx_entrenamiento, idx_prueba, l2 = args
+    entrenamiento = df.iloc[idx_entrenamiento]
+    prueba = df.iloc[idx_prueba]
+
+    modelo = entrenar_modelo(entrenamiento, l2=l2)
+    y = construir_etiqueta(prueba)
+    p = predecir_probabilidad(prueba, modelo)
+
+    p_recortada = np.clip(p, 1e-12, 1 - 1e-12)
+    return {
+        "auc_modelo": auc(y, p),
+        "auc_formula_lineal": auc(y, puntaje_lineal(prueba).to_numpy()),
+        "log_loss": float(-np.mean(y * np.log(p_recortada) + (1 - y) * np.log(1 - p_recortada))),
+        "n_prueba": int(len(y)),
+    }
+
+
+def validacion_cruzada(df: pd.DataFrame, k: int = 5, l2: float = 1.0, semilla: int = 0, n_procesos=None) -> pd.DataFrame:
+    """
+    Validación cruzada en k pliegues, cada pliegue en un proceso distinto.
+    Compara el AUC del modelo con el de la fórmula lineal sobre los mismos datos.
+    """
+    orden = np.random.default_rng(semilla).permutation(len(df))
+    pliegues = np.array_split(orden, k)
+    tareas = [
+        (df, np.concatenate(pliegues[:i] + pliegues[i + 1:]), pliegues[i], l2)
+        for i in range(k)
+    ]
+
+    with ProcessPoolExecutor(max_workers=n_procesos) as pool:
+        resultados = list(pool.map(_evaluar_pliegue, tareas))
+
+    return pd.DataFrame(resultados).rename_axis("pliegue")
+
+
+if __name__ == "__main__":
+    archivo = sys.argv[1] if len(sys.argv) > 1 else "Cuestionario motivacion academica.csv"
+    df_encuesta = pd.read_csv(archivo)
+
+    cv = validacion_cruzada(df_encuesta)
+    print(cv.round(3))
+    print(cv.mean().round(3))
+
+    modelo_final = entrenar_modelo(df_encuesta)
+    guardar_modelo(modelo_final)
+    print(f"Modelo guardado en {ARCHIVO_MODELO}")
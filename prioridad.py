@@ -0,0 +1,97 @@
+import numpy as np
+
+
+def top_k(puntajes: np.ndarray, k: int) -> np.ndarray:
+    """
+    Índices de los k puntajes más altos, de mayor a menor.
+
+    Usa selección parcial (np.argpartition, O(n)) y solo ordena los k
+    elegidos, en vez de ordenar todo el arreglo. Los NaN quedan al final.
+    """
+    puntajes = np.asarray(puntajes, dtype=float)
+    n = len(puntajes)
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.intp)
+
+    negados = -np.nan_to_num(puntajes, nan=-np.inf)
+    if k < n:
+        elegidos = np.argpartition(negados, k - 1)[:k]
+    else:
+        elegidos = np.arange(n)
+    return elegidos[np.argsort(negados[elegidos], kind="stable")]
+
+
+class ColaPrioridad:
+    """
+    Los K estudiantes de mayor riesgo (en total o por carrera), con
+    actualizaciones incrementales.
+
+    Cada consulta se responde desde una caché por grupo. Al agregar filas o
+    cambiar puntajes, la caché se actualiza mirando solo los K actuales más
+    las filas tocadas; solo si baja el puntaje de alguien que estaba en el
+    top se recalcula ese grupo (una selección parcial O(n)).
+    """
+
+    def __init__(self, k: int = 50):
+        self.k = k
+        self._puntajes = np.empty(0, dtype=float)
+        self._grupos = np.empty(0, dtype=object)
+        # grupo -> índices del top-K ordenados (None = todos los estudiantes)
+        self._cache = {}
+
+    def __len__(self) -> int:
+        return len(self._puntajes)
+
+    def _en_grupo(self, indices: np.ndarray, grupo) -> np.ndarray:
+        if grupo is None:
+            return indices
+        return indices[self._grupos[indices] == grupo]
+
+    def _mezclar(self, grupo, candidatos: np.ndarray):
+        """Nuevo top-K del grupo a partir del top actual más algunos candidatos."""
+        candidatos = np.union1d(self._cache[grupo], self._en_grupo(candidatos, grupo))
+        self._cache[grupo] = candidatos[top_k(self._puntajes[candidatos], self.k)]
+
+    def agregar(self, puntajes, grupos=None) -> np.ndarray:
+        """Agrega estudiantes al final. Devuelve sus índices."""
+        puntajes = np.asarray(puntajes, dtype=float)
+        if grupos is None:
+            grupos = np.full(len(puntajes), None, dtype=object)
+
+        inicio = len(self._puntajes)
+        self._puntajes = np.concatenate([self._puntajes, puntajes])
+        self._grupos = np.concatenate([self._grupos, np.asarray(grupos, dtype=object)])
+        nuevos = np.arange(inicio, len(self._puntajes))
+
+        for grupo in list(self._cache):
+            self._mezclar(grupo, nuevos)
+        return nuevos
+
+    def actualizar(self, indices, puntajes_nuevos):
+        """Cambia el puntaje de estudiantes ya agregados (por ejemplo, al re-puntuar)."""
+        indices = np.asarray(indices, dtype=np.intp)
+        puntajes_nuevos = np.asarray(puntajes_nuevos, dtype=float)
+
+        bajaron = indices[puntajes_nuevos < self._puntajes[indices]]
+        self._puntajes[indices] = puntajes_nuevos
+
+        for grupo in list(self._cache):
+            if np.isin(bajaron, self._cache[grupo]).any():
+                # Alguien del top bajó: el reemplazo puede estar en cualquier parte
+                del self._cache[grupo]
+            else:
+                self._mezclar(grupo, indices)
+
+    def consultar(self, grupo=None, k: int | None = None) -> np.ndarray:
+        """
+        Índices de los k estudiantes de mayor puntaje del grupo (o de todos
+        si grupo es None), de mayor a menor. k no puede superar self.k.
+        """
+        k = self.k if k is None else min(k, self.k)
+        if grupo not in self._cache:
+            if grupo is None:
+                miembros = np.arange(len(self._puntajes))
+            else:
+                miembros = np.flatnonzero(self._grupos == grupo)
+            self._cache[grupo] = miembros[top_k(self._puntajes[miembros], self.k)]
+        return self._cache[grupo][:k]
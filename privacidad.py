@@ -0,0 +1,319 @@
+import hashlib
+import os
+import secrets
+import struct
+
+import numpy as np
+import pandas as pd
+
+from alertas import COL_MOTIVACION, COL_REPROBADAS
+from validacion import buscar_columna
+
+# Columna donde queda la clave seudónima del estudiante
+COL_CLAVE = "clave_estudiante"
+
+# Identificadores directos: si aparecen, se reemplazan por la clave seudónima.
+# Se buscan como en la validación (sin distinguir mayúsculas ni tildes, y
+# aceptando texto agregado al final: "Rut", "Correo institucional", ...)
+COLUMNAS_IDENTIFICADORAS = ("RUT", "Matrícula", "Correo", "Dirección de correo electrónico", "Nombre", "ID")
+
+# Columnas que usa la fórmula lineal; con el modelo aprendido se agregan las suyas
+COLUMNAS_MODELO_BASE = (COL_REPROBADAS, COL_MOTIVACION)
+
+# Cuasi-identificadores que se generalizan o se revisan con k-anonimato
+COL_CARRERA = "Carrera que estudias actualmente"
+COL_ANIO = "Año en que te matriculaste"
+COL_GENERO = "Género"
+CUASI_IDENTIFICADORES = (COL_CARRERA, COL_ANIO, COL_GENERO)
+
+# Años de matrícula iguales o anteriores a este se agrupan en un solo tramo
+ANIO_CORTE = 2019
+
+# Tamaño mínimo de grupo para exportar (k-anonimato)
+K_ANONIMATO = 5
+
+# Enteros por bloque al hashear con NumPy: bloques chicos caben en la caché
+# del procesador y el hash completo es casi el doble de rápido
+ENTEROS_POR_BLOQUE = 32_768
+
+# Variable de entorno con el secreto de la seudonimización
+VAR_SECRETO = "ALERTA_SECRETO_SEUDONIMOS"
+
+# Si no hay secreto configurado, se usa uno aleatorio mientras viva el proceso
+_secreto_proceso = secrets.token_bytes(32)
+
+
+def obtener_secreto() -> bytes:
+    """
+    Secreto para las claves seudónimas. Debe configurarse en la variable de
+    entorno ALERTA_SECRETO_SEUDONIMOS para que las claves sean estables entre
+    reinicios (necesario para seguir estudiantes entre olas).
+    """
+    valor = os.environ.get(VAR_SECRETO)
+    return valor.encode("utf-8") if valor else _secreto_proceso
+
+
+def secreto_configurado() -> bool:
+    """Si hay un secreto fijo configurado (claves seudónimas estables entre sesiones)."""
+    return bool(os.environ.get(VAR_SECRETO))
+
+
+def huella_secreto(secreto: bytes | None = None) -> str:
+    """
+    Huella corta del secreto, sin revelarlo. Sirve para separar los datos
+    guardados con secretos distintos, cuyas claves no son comparables.
+    """
+    if secreto is None:
+        secreto = obtener_secreto()
+    return hashlib.blake2b(secreto, digest_size=8, person=b"alerta-olas").hexdigest()
+
+
+def _derivar_clave_hash(secreto: bytes) -> str:
+    """
+    Deriva con BLAKE2b la clave de 16 caracteres que usa el hash vectorizado
+    de pandas (SipHash con clave), así el secreto nunca se usa directamente.
+    """
+    return hashlib.blake2b(secreto, digest_size=8, person=b"alerta-udec").hexdigest()
+
+
+def _rotar(x: np.ndarray, bits: int, tmp: np.ndarray):
+    """Rotación a la izquierda de enteros de 64 bits, en el mismo arreglo."""
+    np.left_shift(x, np.uint64(bits), out=tmp)
+    np.right_shift(x, np.uint64(64 - bits), out=x)
+    np.bitwise_or(x, tmp, out=x)
+
+
+def _ronda_sip(v0, v1, v2, v3, tmp):
+    v0 += v1; _rotar(v1, 13, tmp); v1 ^= v0; _rotar(v0, 32, tmp)
+    v2 += v3; _rotar(v3, 16, tmp); v3 ^= v2
+    v0 += v3; _rotar(v3, 21, tmp); v3 ^= v0
+    v2 += v1; _rotar(v1, 17, tmp); v1 ^= v2; _rotar(v2, 32, tmp)
+
+
+def _siphash_enteros(enteros: np.ndarray, clave_hash: str) -> np.ndarray:
+    """
+    SipHash-2-4 de cada entero de 64 bits (como mensaje de 8 bytes), en bloque
+    con NumPy. Es el mismo algoritmo y la misma clave que usa pandas para el
+    texto, pero evita convertir millones de enteros a texto antes de hashear.
+    """
+    enteros = np.asarray(enteros).astype(np.uint64)
+    k0, k1 = struct.unpack("<QQ", clave_hash.encode("utf-8"))
+    resultado = np.empty(len(enteros), dtype=np.uint64)
+    for inicio in range(0, len(enteros), ENTEROS_POR_BLOQUE):
+        fin = inicio + ENTEROS_POR_BLOQUE
+        resultado[inicio:fin] = _siphash_bloque(enteros[inicio:fin], k0, k1)
+    return resultado
+
+
+def _siphash_bloque(m: np.ndarray, k0: int, k1: int) -> np.ndarray:
+    n = len(m)
+
+    v0 = np.full(n, k0 ^ 0x736F6D6570736575, dtype=np.uint64)
+    v1 = np.full(n, k1 ^ 0x646F72616E646F6D, dtype=np.uint64)
+    v2 = np.full(n, k0 ^ 0x6C7967656E657261, dtype=np.uint64)
+    v3 = np.full(n, k1 ^ 0x7465646279746573, dtype=np.uint64)
+    tmp = np.empty(n, dtype=np.uint64)
+
+    v3 ^= m
+    for _ in range(2):
+        _ronda_sip(v0, v1, v2, v3, tmp)
+    v0 ^= m
+
+    # Último bloque: solo el largo del mensaje (8 bytes) en el byte alto
+    largo = np.uint64(8 << 56)
+    v3 ^= largo
+    for _ in range(2):
+        _ronda_sip(v0, v1, v2, v3, tmp)
+    v0 ^= largo
+
+    v2 ^= np.uint64(0xFF)
+    for _ in range(4):
+        _ronda_sip(v0, v1, v2, v3, tmp)
+    return v0 ^ v1 ^ v2 ^ v3
+
+
+def hash_con_clave(valores: pd.Series, secreto: bytes) -> pd.Series:
+    """
+    Hash con clave (64 bits) de cada valor, calculado en bloque sobre todo el
+    arreglo y no fila por fila en Python.
+
+    Los identificadores enteros se hashean como número, vengan como entero,
+    como float (123.0, cuando la columna tiene algún vacío) o como texto
+    ("123"; también "0123", igual que al leerlo como número). El resto se
+    hashea como texto. Los vacíos quedan como <NA>, no como una clave común.
+    """
+    serie = pd.Series(valores)
+    clave_hash = _derivar_clave_hash(secreto)
+    vacios = serie.isna().to_numpy()
+    resultado = np.zeros(len(serie), dtype=np.uint64)
+
+    if pd.api.types.is_integer_dtype(serie.dtype):
+        es_entero = ~vacios
+        enteros = serie.to_numpy(dtype=np.int64, na_value=0)
+        texto = None
+    elif pd.api.types.is_float_dtype(serie.dtype):
+        numeros = serie.to_numpy(dtype=float, na_value=np.nan)
+        es_entero = ~vacios & (np.mod(numeros, 1) == 0) & (np.abs(numeros) < 2**63)
+        enteros = np.where(es_entero, numeros, 0).astype(np.int64)
+        texto = serie.astype(str)
+    else:
+        texto = serie.astype(str)
+        # Filtro rápido con isdigit; la expresión regular descarta los dígitos
+        # no ASCII y los números de más de 18 cifras (que no caben en un int64)
+        es_entero = texto.str.isdigit().to_numpy(dtype=bool, na_value=False, copy=True)
+        enteros = np.zeros(len(serie), dtype=np.int64)
+        if es_entero.any():
+            es_entero[es_entero] = texto[es_entero].str.fullmatch(r"[0-9]{1,18}").to_numpy(dtype=bool)
+            enteros[es_entero] = texto[es_entero].astype(np.int64).to_numpy()
+
+    resultado[es_entero] = _siphash_enteros(enteros[es_entero], clave_hash)
+
+    es_texto = ~vacios & ~es_entero
+    if es_texto.any():
+        resultado[es_texto] = pd.util.hash_array(
+            texto[es_texto].to_numpy(dtype=object), hash_key=clave_hash, categorize=False
+        )
+
+    return pd.Series(pd.arrays.IntegerArray(resultado, vacios), index=serie.index)
+
+
+def _combinar_hashes(hashes: list) -> pd.Series:
+    """
+    Combina los hashes de varias columnas identificadoras en una sola clave
+    (vectorizado). Un identificador vacío entra como 0; si están todos
+    vacíos, la clave queda vacía.
+    """
+    combinado = np.zeros(len(hashes[0]), dtype=np.uint64)
+    todos_vacios = np.ones(len(hashes[0]), dtype=bool)
+    for h in hashes:
+        combinado *= np.uint64(1_000_003)
+        combinado ^= h.to_numpy(dtype=np.uint64, na_value=0)
+        todos_vacios &= h.isna().to_numpy()
+    return pd.Series(pd.arrays.IntegerArray(combinado, todos_vacios), index=hashes[0].index)
+
+
+def seudonimizar(
+    df_raw: pd.DataFrame,
+    secreto: bytes | None = None,
+    columnas_identificadoras=COLUMNAS_IDENTIFICADORAS,
+    columnas_modelo=COLUMNAS_MODELO_BASE,
+    generar_clave: bool = False,
+) -> pd.DataFrame:
+    """
+    Prepara la encuesta antes de calcular las alertas. Solo se conservan:
+
+    - las columnas que usa el modelo (columnas_modelo), sin modificar;
+    - los cuasi-identificadores, con los años de matrícula antiguos agrupados
+      en un solo tramo;
+    - con generar_clave, la clave seudónima COL_CLAVE: un hash con clave de
+      los identificadores directos (RUT, correo, etc.).
+
+    Todo lo demás (identificadores, ciudad de origen, texto libre y cualquier
+    columna no prevista) se elimina. Los nombres se buscan igual que en la
+    validación y quedan con el nombre esperado.
+
+    La clave solo hace falta para seguir estudiantes entre olas y es lo único
+    caro: con un identificador distinto por fila, el hash cuesta del orden
+    de un tercio (enteros) a todo (texto) el tiempo de puntuar con la fórmula
+    lineal. Por eso no se calcula por defecto; sin ella los identificadores
+    simplemente se eliminan.
+    """
+    if secreto is None:
+        secreto = obtener_secreto()
+    columnas = list(df_raw.columns)
+
+    # En el orden de columnas_identificadoras (no del archivo), para que la
+    # clave no dependa del orden de las columnas
+    identificadoras = []
+    for nombre in columnas_identificadoras:
+        real = buscar_columna(nombre, columnas)
+        if real is not None and real not in identificadoras:
+            identificadoras.append(real)
+
+    conservar = {}
+    for nombre in (*columnas_modelo, *CUASI_IDENTIFICADORES, COL_CLAVE):
+        real = buscar_columna(nombre, columnas)
+        if real is not None and real not in identificadoras and real not in conservar:
+            conservar[real] = nombre
+    df = df_raw[[c for c in columnas if c in conservar]].rename(columns=conservar)
+
+    if generar_clave and identificadoras:
+        hashes = [hash_con_clave(df_raw[c], secreto) for c in identificadoras]
+        df[COL_CLAVE] = hashes[0] if len(hashes) == 1 else _combinar_hashes(hashes)
+
+    if COL_ANIO in df.columns:
+        df[COL_ANIO] = generalizar_anio(df[COL_ANIO])
+
+    return df
+
+
+def generalizar_anio(anios: pd.Series) -> pd.Series:
+    """
+    Años <= ANIO_CORTE (o textos como 'Antes de 2015') pasan a 'ANIO_CORTE o antes'.
+    Devuelve una columna categórica (los vacíos quedan vacíos).
+    """
+    # Se generalizan los valores distintos (unos pocos) y solo se reindexan
+    # los códigos de cada fila, sin construir un texto por fila
+    codigos, unicos = pd.factorize(anios)
+    numericos = pd.to_numeric(pd.Series(unicos), errors="coerce")
+
+    generalizados = pd.Series(unicos).astype(str).to_numpy(dtype=object)
+    enteros = numericos.notna().to_numpy()
+    generalizados[enteros] = numericos[enteros].astype(int).astype(str).to_numpy()
+    generalizados[~enteros | (numericos <= ANIO_CORTE).to_numpy()] = f"{ANIO_CORTE} o antes"
+
+    codigos_nuevos, categorias = pd.factorize(generalizados, sort=True)
+    # factorize marca los valores faltantes con -1, que from_codes también trata
+    # como vacío. Los códigos caben en int8 (unos pocos tramos) y ya son válidos
+    mapa = np.append(codigos_nuevos, -1).astype(np.int8)
+    resultado = pd.Categorical.from_codes(mapa[codigos], categories=categorias, validate=False)
+    return pd.Series(resultado, index=anios.index, name=anios.name)
+
+
+def grupos_bajo_k(df: pd.DataFrame, cuasi_identificadores=CUASI_IDENTIFICADORES, k: int = K_ANONIMATO) -> pd.DataFrame:
+    """Combinaciones de cuasi-identificadores que tienen menos de k filas."""
+    columnas = [c for c in cuasi_identificadores if c in df.columns]
+    if not columnas:
+        return pd.DataFrame(columns=["cantidad"])
+
+    conteo = df.groupby(columnas, dropna=False).size().rename("cantidad").reset_index()
+    return conteo[conteo["cantidad"] < k]
+
+
+def anonimizar_exportacion(df: pd.DataFrame, cuasi_identificadores=CUASI_IDENTIFICADORES, k: int = K_ANONIMATO) -> pd.DataFrame:
+    """
+    Aplica k-anonimato a una tabla por estudiante antes de exportarla:
+    en las filas cuya combinación de cuasi-identificadores aparece menos de
+    k veces, esos campos se reemplazan por '*'.
+    """
+    columnas = [c for c in cuasi_identificadores if c in df.columns]
+    if not columnas or df.empty:
+        return df
+
+    tamanos = df.groupby(columnas, dropna=False, sort=False)[columnas[0]].transform("size")
+    pequenos = (tamanos < k).to_numpy()
+    if not pequenos.any():
+        return df
+
+    df = df.copy()
+    for c in columnas:
+        df[c] = df[c].astype(object)
+        df.loc[pequenos, c] = "*"
+    return df
+
+
+def suprimir_grupos_pequenos(df_agregado: pd.DataFrame, col_conteo: str, k: int = K_ANONIMATO, metricas=None) -> pd.DataFrame:
+    """
+    Para tablas agregadas: oculta (NaN) las métricas de los grupos con menos
+    de k personas, dejando visible solo el conteo. Si no se indican las
+    métricas, se ocultan todas las columnas numéricas salvo el conteo.
+    """
+    pequenos = df_agregado[col_conteo] < k
+    if not pequenos.any():
+        return df_agregado
+
+    df = df_agregado.copy()
+    if metricas is None:
+        metricas = [c for c in df.select_dtypes("number").columns if c != col_conteo]
+    df.loc[pequenos, metricas] = np.nan
+    return df
@@ -0,0 +1,305 @@
+"""
+Generador del reporte MVP por carrera (admisión histórica + motivación).
+
+Ambas bases se agregan por carrera leyendo por bloques (cruce.agregar_por_bloques),
+así una década de admisión o varias olas de la encuesta no tienen que caber
+en memoria; el cruce por carrera se hace después sobre esos agregados.
+
+Los agregados intermedios se guardan en caché, indexados por una huella
+(hash BLAKE2 del contenido). Si los archivos no cambiaron, no se vuelven a
+leer ni agregar; si además el reporte ya está escrito con la misma huella,
+no se vuelve a generar.
+
+Uso desde la terminal (una o más olas de la encuesta):
+
+    python reporte.py Data_UINN_Facultad.csv "Cuestionario motivacion academica.csv" [otra_ola.csv ...] reportes
+"""
+import hashlib
+import html
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from alertas import COL_MOTIVACION
+from carreras import ARCHIVO_CARRERAS, RegistroCarreras
+from cruce import ORIGEN_AMBOS, agregar_por_bloques, unir_ordenado
+from privacidad import COL_CARRERA, suprimir_grupos_pequenos
+from validacion import compilar_reglas
+
+# Cambiar este número invalida la caché cuando cambia la forma de agregar
+VERSION_AGREGADOS = 3
+
+CARPETA_CACHE = ".cache_reportes"
+ARCHIVO_REPORTE = "reporte_mvp_integrado_CARRERAS_FINAL.csv"
+ARCHIVO_MANIFIESTO = "manifiesto.json"
+
+# Columnas de la base de admisión
+COL_ADM_CARRERA_NACIONAL = "Código Carrera Nacional"
+COL_ADM_PONDERADO = "Puntaje Ponderado"
+COL_ADM_PAES_MAT = "Puntaje Matemáticas"
+
+COLUMNAS_REPORTE = [
+    "Nombre_Carrera",
+    "Pct_Baja_Motivacion",
+    "Avg_Ponderado_Hist",
+    "Avg_PAES_Mat_Hist",
+    "Total_Respuestas_Encuesta",
+    "Total_Estudiantes_Hist",
+]
+
+
+def huella_archivo(ruta: str) -> str:
+    """Hash BLAKE2 del contenido del archivo (leído por bloques)."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def huella_archivos(rutas) -> str:
+    """Huella de una o más olas: la de cada archivo, combinada en orden."""
+    if isinstance(rutas, str):
+        return huella_archivo(rutas)
+    h = hashlib.blake2b(digest_size=16)
+    for ruta in rutas:
+        h.update(huella_archivo(ruta).encode("ascii"))
+    return h.hexdigest()
+
+
+def _con_cache(tipo: str, huella: str, calcular, carpeta_cache: str) -> pd.DataFrame:
+    """Devuelve el agregado guardado para esta huella o lo calcula y lo guarda."""
+    ruta = os.path.join(carpeta_cache, f"{tipo}_v{VERSION_AGREGADOS}_{huella}.pkl")
+    if os.path.exists(ruta):
+        return pd.read_pickle(ruta)
+
+    df = calcular()
+    os.makedirs(carpeta_cache, exist_ok=True)
+    df.to_pickle(ruta)
+    return df
+
+
+def _normalizar_admision(df_facultad: pd.DataFrame) -> pd.DataFrame:
+    df = df_facultad.rename(columns={
+        COL_ADM_CARRERA_NACIONAL: "Codigo_Carrera_Nacional",
+        COL_ADM_PONDERADO: "Puntaje_Ponderado",
+        COL_ADM_PAES_MAT: "Puntaje_Matematicas",
+    })
+
+    # Por si el puntaje viene como texto con coma decimal
+    if not pd.api.types.is_numeric_dtype(df["Puntaje_Ponderado"]):
+        df["Puntaje_Ponderado"] = pd.to_numeric(
+            df["Puntaje_Ponderado"].astype(str).str.replace(",", ".", regex=False),
+            errors="coerce",
+        )
+    return df
+
+
+def agregar_admision(ruta_admision: str) -> pd.DataFrame:
+    """
+    Promedios históricos de admisión por código de carrera nacional.
+    El archivo se lee por bloques, así una década de admisión no tiene que
+    caber completa en memoria.
+    """
+    return agregar_por_bloques(
+        ruta_admision,
+        "Codigo_Carrera_Nacional",
+        {
+            "Avg_Ponderado_Hist": "Puntaje_Ponderado",
+            "Avg_PAES_Mat_Hist": "Puntaje_Matematicas",
+        },
+        "Total_Estudiantes_Hist",
+        transformar=_normalizar_admision,
+    )
+
+
+def _normalizar_encuesta(df_cuestionario: pd.DataFrame) -> pd.DataFrame:
+    col_motivacion = compilar_reglas([{"columna": COL_MOTIVACION}], df_cuestionario.columns)[0]["columna_real"]
+    if col_motivacion is None:
+        raise KeyError(f"No se pudo encontrar la columna de motivación que comienza con: '{COL_MOTIVACION}'")
+
+    motivacion = pd.to_numeric(df_cuestionario[col_motivacion], errors="coerce")
+    return pd.DataFrame({
+        "merge_key_udec": pd.to_numeric(df_cuestionario[COL_CARRERA], errors="coerce"),
+        "Riesgo_Baja_Motivacion": (motivacion <= 2).astype(int),
+    })
+
+
+def agregar_encuesta(rutas_encuesta) -> pd.DataFrame:
+    """
+    Porcentaje de baja motivación (<= 2) por código de carrera UDEC, sobre
+    una o más olas de la encuesta (leídas por bloques).
+    """
+    return agregar_por_bloques(
+        rutas_encuesta,
+        "merge_key_udec",
+        {"Pct_Baja_Motivacion": "Riesgo_Baja_Motivacion"},
+        "Total_Respuestas_Encuesta",
+        transformar=_normalizar_encuesta,
+    )
+
+
+def _sin_mapeo(codigos: pd.Series, cantidades: pd.Series, traduccion) -> dict:
+    """Código sin mapeo -> cantidad de personas (no de filas agregadas)."""
+    faltantes = traduccion.codigos.isna() & codigos.notna()
+    por_codigo = cantidades[faltantes].groupby(codigos[faltantes]).sum()
+    return {
+        (int(c) if float(c).is_integer() else float(c)): int(n)
+        for c, n in por_codigo.items()
+    }
+
+
+def construir_reporte(df_admision: pd.DataFrame, df_riesgo: pd.DataFrame, registro: RegistroCarreras) -> tuple:
+    """
+    Cruza ambos agregados por código UDEC y da formato al reporte final.
+
+    Devuelve (df_reporte, sin_mapeo, diagnostico) donde sin_mapeo informa,
+    para cada base, los códigos que no están en el registro de carreras y
+    cuántas personas quedaron fuera por eso, y diagnostico (DiagnosticoCruce)
+    cuántas carreras quedaron solo en una de las dos bases.
+    """
+    df_admision = df_admision.copy()
+    traduccion_adm = registro.nacional_a_udec(df_admision["Codigo_Carrera_Nacional"])
+    traduccion_enc = registro.udec_a_nacional(df_riesgo["merge_key_udec"])
+    sin_mapeo = {
+        "admision": _sin_mapeo(
+            df_admision["Codigo_Carrera_Nacional"], df_admision["Total_Estudiantes_Hist"], traduccion_adm
+        ),
+        "encuesta": _sin_mapeo(
+            df_riesgo["merge_key_udec"], df_riesgo["Total_Respuestas_Encuesta"], traduccion_enc
+        ),
+    }
+
+    df_admision["merge_key_udec"] = traduccion_adm.codigos
+    df_admision = df_admision.dropna(subset=["merge_key_udec"])
+    df_riesgo = df_riesgo.assign(merge_key_udec=df_riesgo["merge_key_udec"].astype("Int64"))
+
+    # Cruce externo para poder informar qué carreras quedaron sin par; el
+    # reporte solo usa las que están en ambas bases
+    df_final, diagnostico = unir_ordenado(df_admision, df_riesgo, "merge_key_udec", how="outer")
+    df_final = df_final[df_final["_origen"] == ORIGEN_AMBOS].astype(
+        {"Total_Estudiantes_Hist": int, "Total_Respuestas_Encuesta": int}
+    )
+
+    df_final["Nombre_Carrera"] = registro.nombres_udec(df_final["merge_key_udec"])
+    df_final["Pct_Baja_Motivacion"] = (df_final["Pct_Baja_Motivacion"] * 100).round(1)
+    df_final["Avg_Ponderado_Hist"] = df_final["Avg_Ponderado_Hist"].round(1)
+    df_final["Avg_PAES_Mat_Hist"] = df_final["Avg_PAES_Mat_Hist"].round(1)
+
+    # Carreras con muy pocas respuestas: no se publica el % de baja motivación
+    df_final = suprimir_grupos_pequenos(
+        df_final, "Total_Respuestas_Encuesta", metricas=["Pct_Baja_Motivacion"]
+    )
+
+    df_final = df_final.sort_values(by="Pct_Baja_Motivacion", ascending=False)
+    return df_final[COLUMNAS_REPORTE].reset_index(drop=True), sin_mapeo, diagnostico
+
+
+def _nombre_archivo(nombre_carrera: str) -> str:
+    return "".join(c if c.isalnum() else "_" for c in nombre_carrera).strip("_")
+
+
+def _escribir_carrera(fila: pd.Series, carpeta_salida: str) -> str:
+    """Escribe el reporte de una carrera en CSV y HTML. Devuelve el nombre base."""
+    base = _nombre_archivo(fila["Nombre_Carrera"])
+    df_carrera = fila.to_frame().T
+    # El nombre viene de carreras.json (editable): se escapa antes de ponerlo en el HTML
+    nombre = html.escape(fila["Nombre_Carrera"])
+
+    df_carrera.to_csv(os.path.join(carpeta_salida, f"{base}.csv"), index=False, sep=";", encoding="latin1")
+    with open(os.path.join(carpeta_salida, f"{base}.html"), "w", encoding="utf-8") as f:
+        f.write(
+            "<html><head><meta charset='utf-8'>"
+            f"<title>Reporte MVP – {nombre}</title></head><body>"
+            f"<h1>{nombre}</h1>"
+            f"{df_carrera.to_html(index=False, na_rep='—')}"
+            "</body></html>"
+        )
+    return base
+
+
+def generar_reportes(
+    archivo_admision: str,
+    archivos_encuesta,
+    carpeta_salida: str,
+    carpeta_cache: str = CARPETA_CACHE,
+    archivo_carreras: str = ARCHIVO_CARRERAS,
+    max_hilos: int = 4,
+    forzar: bool = False,
+) -> pd.DataFrame:
+    """
+    Genera el reporte integrado (ARCHIVO_REPORTE) y un CSV + HTML por carrera
+    en carpeta_salida. Devuelve el reporte integrado. archivos_encuesta puede
+    ser un archivo o una lista (varias olas de la encuesta).
+
+    Si las huellas de los archivos y la versión del registro de carreras
+    coinciden con las del manifiesto de la carpeta de salida, se devuelve el
+    reporte ya escrito sin recalcular nada. Los códigos de carrera sin mapeo
+    y el diagnóstico del cruce quedan informados en el manifiesto.
+    """
+    registro = RegistroCarreras.desde_archivo(archivo_carreras)
+
+    huella_adm = huella_archivo(archivo_admision)
+    huella_enc = huella_archivos(archivos_encuesta)
+    huella_reporte = f"v{VERSION_AGREGADOS}:{registro.version}:{huella_adm}:{huella_enc}"
+
+    ruta_reporte = os.path.join(carpeta_salida, ARCHIVO_REPORTE)
+    ruta_manifiesto = os.path.join(carpeta_salida, ARCHIVO_MANIFIESTO)
+
+    if not forzar and os.path.exists(ruta_manifiesto) and os.path.exists(ruta_reporte):
+        with open(ruta_manifiesto, encoding="utf-8") as f:
+            if json.load(f).get("huella") == huella_reporte:
+                return pd.read_csv(ruta_reporte, sep=";", encoding="latin1")
+
+    df_admision = _con_cache(
+        "admision", huella_adm, lambda: agregar_admision(archivo_admision), carpeta_cache
+    )
+    df_riesgo = _con_cache(
+        "encuesta", huella_enc, lambda: agregar_encuesta(archivos_encuesta), carpeta_cache
+    )
+    df_reporte, sin_mapeo, diagnostico = construir_reporte(df_admision, df_riesgo, registro)
+
+    os.makedirs(carpeta_salida, exist_ok=True)
+    df_reporte.to_csv(ruta_reporte, index=False, sep=";", encoding="latin1")
+
+    # Un archivo por carrera, escritos en paralelo
+    with ThreadPoolExecutor(max_workers=max_hilos) as pool:
+        archivos = list(pool.map(
+            lambda fila: _escribir_carrera(fila, carpeta_salida),
+            (fila for _, fila in df_reporte.iterrows()),
+        ))
+
+    with open(ruta_manifiesto, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "huella": huella_reporte,
+                "version_carreras": registro.version,
+                "carreras": archivos,
+                "sin_mapeo": {base: {str(c): n for c, n in m.items()} for base, m in sin_mapeo.items()},
+                "cruce": diagnostico.como_dict(),
+            },
+            f, ensure_ascii=False, indent=2,
+        )
+
+    return df_reporte
+
+
+if __name__ == "__main__":
+    argumentos = [a for a in sys.argv[1:] if a != "--forzar"]
+    if len(argumentos) < 3:
+        print(__doc__)
+        sys.exit(1)
+
+    *encuestas, carpeta = argumentos[1:]
+    reporte = generar_reportes(argumentos[0], encuestas, carpeta, forzar="--forzar" in sys.argv)
+    print(reporte.to_string(index=False))
+
+    with open(os.path.join(carpeta, ARCHIVO_MANIFIESTO), encoding="utf-8") as f:
+        manifiesto = json.load(f)
+    for base, codigos in manifiesto["sin_mapeo"].items():
+        if codigos:
+            print(f"Códigos sin mapeo en {base}: {codigos}")
+    print(f"Cruce por carrera: {manifiesto['cruce']}")
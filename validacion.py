@@ -0,0 +1,275 @@
+import csv
+import functools
+import io
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from alertas import COL_MOTIVACION, COL_REPROBADAS
+
+# Bytes que se leen para detectar el formato del archivo
+BYTES_MUESTRA = 64 * 1024
+
+SEPARADORES = [",", ";", "\t", "|"]
+CODIFICACIONES = ["utf-8-sig", "latin1"]
+
+# Si más de esta fracción de filas es inválida, se rechaza el archivo completo
+MAX_FRACCION_INVALIDA = 0.5
+
+# Máximo de columnas faltantes y de motivos que se listan en el reporte
+MAX_DETALLES_REPORTE = 8
+
+# Reglas de la encuesta: columna, valor mínimo, valor máximo y si debe ser entero.
+# Con "permite_vacio" las celdas vacías no invalidan la fila.
+REGLAS_ENCUESTA = [
+    {"columna": COL_REPROBADAS, "minimo": 0, "maximo": 80, "entero": True},
+    {"columna": COL_MOTIVACION, "minimo": 1, "maximo": 5, "entero": True},
+]
+
+_patron_decimal_coma = re.compile(r"^-?\d+,\d+$")
+
+
+def nombre_corto(columna: str, largo: int = 60) -> str:
+    """Nombre abreviado (inicio…final) para el reporte; muchas preguntas solo difieren al final."""
+    if len(columna) <= largo:
+        return columna
+    return columna[:30].rstrip() + "…" + columna[-(largo - 35):].lstrip()
+
+
+class ErrorValidacion(ValueError):
+    """El archivo no se puede puntuar; el reporte explica por qué."""
+
+    def __init__(self, reporte: "ReporteValidacion"):
+        super().__init__(reporte.resumen())
+        self.reporte = reporte
+
+
+class ReporteValidacion:
+    """Resultado compacto de validar un archivo (se muestra antes de puntuar)."""
+
+    def __init__(self, formato: dict):
+        self.formato = formato
+        self.columnas_faltantes = []
+        self.total_filas = 0
+        self.filas_validas = 0
+        self.errores_por_regla = {}
+        # Números de línea en el archivo (contando metadata y encabezado, desde 1)
+        self.ejemplos_por_regla = {}
+        self.rechazado = False
+
+    @property
+    def filas_invalidas(self) -> int:
+        return self.total_filas - self.filas_validas
+
+    def resumen(self) -> str:
+        if self.columnas_faltantes:
+            listadas = [nombre_corto(c) for c in self.columnas_faltantes[:MAX_DETALLES_REPORTE]]
+            restantes = len(self.columnas_faltantes) - len(listadas)
+            texto = (
+                "No se encontraron las columnas necesarias en el dataset. "
+                f"Faltan {len(self.columnas_faltantes)}: {listadas}"
+            )
+            if restantes:
+                texto += f" y {restantes} más."
+            return texto
+
+        lineas = [
+            f"Formato detectado: codificación {self.formato['encoding']}, "
+            f"separador '{self.formato['sep']}', "
+            f"{self.formato['skiprows']} fila(s) de metadata omitida(s).",
+            f"Filas válidas: {self.filas_validas} de {self.total_filas}.",
+        ]
+        errores = [(regla, cantidad) for regla, cantidad in self.errores_por_regla.items() if cantidad]
+        for regla, cantidad in errores[:MAX_DETALLES_REPORTE]:
+            ejemplos = ", ".join(str(i) for i in self.ejemplos_por_regla[regla])
+            lineas.append(f"- {regla}: {cantidad} fila(s) (ej. líneas {ejemplos} del archivo)")
+        if len(errores) > MAX_DETALLES_REPORTE:
+            lineas.append(f"- … y {len(errores) - MAX_DETALLES_REPORTE} motivo(s) más.")
+        if self.rechazado and self.filas_validas == 0:
+            lineas.append("Archivo rechazado: no tiene filas válidas para puntuar.")
+        elif self.rechazado:
+            lineas.append(
+                f"Archivo rechazado: más del {MAX_FRACCION_INVALIDA:.0%} de las filas es inválido."
+            )
+        return "\n".join(lineas)
+
+
+def detectar_formato(muestra: bytes) -> dict:
+    """
+    Detecta codificación, separador, filas de metadata antes del encabezado
+    y separador decimal usando solo los primeros KB del archivo.
+
+    Devuelve un dict que se puede pasar directo a pd.read_csv(**formato).
+    """
+    # Cortar en el último salto de línea para no partir un carácter ni una fila
+    corte = muestra.rfind(b"\n")
+    if corte > 0:
+        muestra = muestra[:corte]
+
+    texto = None
+    encoding = CODIFICACIONES[-1]
+    for encoding in CODIFICACIONES:
+        try:
+            texto = muestra.decode(encoding)
+            break
+        except UnicodeDecodeError:
+            continue
+
+    lineas = texto.splitlines()
+    if not lineas:
+        raise ValueError("El archivo está vacío.")
+
+    # El separador es el que aparece más veces en la línea con más campos
+    sep = max(SEPARADORES, key=lambda s: max(linea.count(s) for linea in lineas[:50]))
+
+    # Filas de metadata: líneas iniciales con menos de la mitad de los campos llenos
+    filas = list(csv.reader(lineas[:50], delimiter=sep))
+    n_campos = max(len(f) for f in filas)
+    skiprows = 0
+    for fila in filas:
+        if sum(bool(c.strip()) for c in fila) >= n_campos / 2:
+            break
+        skiprows += 1
+
+    # Coma decimal: solo posible si el separador no es coma
+    decimal = "."
+    if sep != ",":
+        datos = [c for fila in filas[skiprows + 1:] for c in fila]
+        if any(_patron_decimal_coma.match(c.strip()) for c in datos):
+            decimal = ","
+
+    return {"encoding": encoding, "sep": sep, "skiprows": skiprows, "decimal": decimal}
+
+
+def leer_encabezado(muestra: bytes, formato: dict) -> list:
+    """Nombres de columna según el formato detectado, sin leer el archivo completo."""
+    texto = muestra.decode(formato["encoding"], errors="replace")
+    lineas = texto.splitlines()[formato["skiprows"]:]
+    if not lineas:
+        return []
+    return next(csv.reader([lineas[0]], delimiter=formato["sep"]))
+
+
+@functools.lru_cache(maxsize=4096)
+def normalizar_nombre(columna) -> str:
+    """Nombre de columna comparable: sin tildes, en minúsculas y sin espacios repetidos."""
+    texto = unicodedata.normalize("NFKD", str(columna))
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return " ".join(texto.lower().split())
+
+
+def buscar_columna(nombre: str, columnas) -> str | None:
+    """
+    Columna real del archivo que corresponde a `nombre`: la que tiene el mismo
+    nombre o, si no hay, la primera que empieza con él (algunas exportaciones
+    agregan texto al final de la pregunta). No distingue mayúsculas, tildes ni
+    espacios repetidos, y el prefijo debe cortar en un límite de palabra
+    ("ID" calza con "ID estudiante" pero no con "Idioma").
+    """
+    if nombre in columnas:
+        return nombre
+
+    buscado = normalizar_nombre(nombre)
+    normalizadas = [(c, normalizar_nombre(c)) for c in columnas]
+    for real, normalizada in normalizadas:
+        if normalizada == buscado:
+            return real
+    for real, normalizada in normalizadas:
+        if normalizada.startswith(buscado) and not (
+            buscado[-1:].isalnum() and normalizada[len(buscado)].isalnum()
+        ):
+            return real
+    return None
+
+
+def compilar_reglas(reglas: list, columnas) -> list:
+    """Resuelve cada regla contra las columnas reales del archivo (ver buscar_columna)."""
+    columnas = list(columnas)
+    return [{**regla, "columna_real": buscar_columna(regla["columna"], columnas)} for regla in reglas]
+
+
+def validar_encabezado(muestra: bytes, reglas: list = REGLAS_ENCUESTA) -> tuple:
+    """
+    Primer paso, barato: detecta el formato y revisa que estén las columnas.
+    Lanza ErrorValidacion si faltan columnas (sin haber parseado el archivo).
+    Devuelve (formato, reglas_compiladas).
+    """
+    formato = detectar_formato(muestra[:BYTES_MUESTRA])
+    columnas = leer_encabezado(muestra[:BYTES_MUESTRA], formato)
+    compiladas = compilar_reglas(reglas, columnas)
+
+    faltantes = [r["columna"] for r in compiladas if r["columna_real"] is None]
+    if faltantes:
+        reporte = ReporteValidacion(formato)
+        reporte.columnas_faltantes = faltantes
+        raise ErrorValidacion(reporte)
+
+    return formato, compiladas
+
+
+def validar_filas(df: pd.DataFrame, reglas_compiladas: list, formato: dict) -> tuple:
+    """
+    Revisa tipos y rangos con máscaras vectorizadas en una sola pasada.
+
+    Devuelve (df_valido, df_cuarentena, reporte). En df_valido las columnas
+    de las reglas quedan numéricas y con el nombre esperado por el modelo.
+    Lanza ErrorValidacion si el archivo completo debe rechazarse (también si
+    no queda ninguna fila válida, por ejemplo un archivo con solo encabezado).
+    """
+    reporte = ReporteValidacion(formato)
+    reporte.total_filas = len(df)
+
+    # Fila de datos i (desde 0) -> línea del archivo: metadata + encabezado + 1
+    primera_linea = formato["skiprows"] + 2
+
+    invalida = np.zeros(len(df), dtype=bool)
+    numericas = {}
+    for regla in reglas_compiladas:
+        original = df[regla["columna_real"]]
+        valores = pd.to_numeric(original, errors="coerce")
+        numericas[regla["columna"]] = valores
+
+        faltante = original.isna().to_numpy()
+        if regla.get("permite_vacio"):
+            faltante = np.zeros(len(df), dtype=bool)
+        no_numerico = (valores.isna() & original.notna()).to_numpy()
+        fuera_rango = ((valores < regla["minimo"]) | (valores > regla["maximo"])).to_numpy()
+        no_entero = np.zeros(len(df), dtype=bool)
+        if regla.get("entero"):
+            no_entero = (valores.notna() & (valores % 1 != 0)).to_numpy()
+
+        corto = nombre_corto(regla["columna"])
+        for motivo, mascara in (
+            ("vacío", faltante),
+            ("no numérico", no_numerico),
+            (f"fuera de rango [{regla['minimo']}, {regla['maximo']}]", fuera_rango),
+            ("no entero", no_entero),
+        ):
+            cantidad = int(mascara.sum())
+            if cantidad:
+                clave = f"{corto}: {motivo}"
+                reporte.errores_por_regla[clave] = cantidad
+                reporte.ejemplos_por_regla[clave] = (np.flatnonzero(mascara)[:5] + primera_linea).tolist()
+            invalida |= mascara
+
+    reporte.filas_validas = int((~invalida).sum())
+    if reporte.filas_validas == 0 or reporte.filas_invalidas / len(df) > MAX_FRACCION_INVALIDA:
+        reporte.rechazado = True
+        raise ErrorValidacion(reporte)
+
+    df_valido = df.loc[~invalida].copy()
+    for regla in reglas_compiladas:
+        if regla["columna_real"] != regla["columna"]:
+            df_valido = df_valido.rename(columns={regla["columna_real"]: regla["columna"]})
+        df_valido[regla["columna"]] = numericas[regla["columna"]][~invalida]
+
+    return df_valido, df.loc[invalida], reporte
+
+
+def leer_y_validar(datos: bytes, reglas: list = REGLAS_ENCUESTA) -> tuple:
+    """Atajo para archivos pequeños: valida encabezado, lee todo y valida filas."""
+    formato, compiladas = validar_encabezado(datos, reglas)
+    df = pd.read_csv(io.BytesIO(datos), **formato)
+    return validar_filas(df, compiladas, formato)